@@ -0,0 +1,109 @@
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+# Qt module ขนาดใหญ่ที่ไม่ควรถูกโหลดก่อนหน้าต่างหลักแสดงผลครั้งแรก
+HEAVY_MODULES = ("PyQt6.QtWebEngineWidgets", "PyQt6.QtWebEngineCore", "PyQt6.QtChart")
+
+def build_window():
+    """
+    สร้างหน้าต่างที่ใช้วัดผล
+
+    DiscordFileDownloader ยังสร้างไม่ได้ใน tree นี้ (เมธอดสร้างแท็บ เมนู และ API server ยังไม่มี)
+    จึงประกอบหน้าต่างจากส่วนเดียวกับที่หน้าต่างหลักใช้: ส่วนหัว, แท็บบาร์, ธีม
+    และแท็บสถิติแบบ lazy ที่เพิ่มหลังแสดงผลเหมือน DiscordFileDownloader
+    """
+    from PyQt6.QtWidgets import QMainWindow, QTabWidget, QWidget
+    from PyQt6.QtCore import QTimer
+    from ui import components
+    from ui.components import LazyWidget
+    from ui.main_window import ModernTabBar, AnimatedHeader
+    from ui.themes import apply_theme
+
+    window = QMainWindow()
+    window.resize(1200, 800)
+    tab_widget = QTabWidget()
+    tab_widget.setTabBar(ModernTabBar())
+    tab_widget.addTab(QWidget(), "Download")
+    window.setCentralWidget(tab_widget)
+    window.setMenuWidget(AnimatedHeader())
+    QTimer.singleShot(0, lambda: tab_widget.addTab(LazyWidget(lambda: components.StatsDashboard()), "Statistics"))
+    apply_theme(window, "Dark")
+    return window
+
+def run_child() -> None:
+    """
+    เปิดโปรแกรมหนึ่งครั้งแล้วรายงานเวลาจนถึงการวาดหน้าต่างหลักครั้งแรก (ทำงานใน process ใหม่)
+    """
+    started = time.perf_counter()
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QObject, QEvent
+    import ui.main_window  # วัดเวลา import ของหน้าต่างหลักทั้งหมด
+    imported = time.perf_counter()
+
+    app = QApplication(sys.argv[:1])
+    result = {"import_ms": (imported - started) * 1000}
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint and "paint_ms" not in result:
+                result["paint_ms"] = (time.perf_counter() - started) * 1000
+                result["heavy_modules"] = [name for name in HEAVY_MODULES if name in sys.modules]
+                app.quit()
+            return False
+
+    window = build_window()
+    result["construct_ms"] = (time.perf_counter() - started) * 1000
+    first_paint = FirstPaint()
+    window.installEventFilter(first_paint)
+    window.show()
+    app.exec()
+
+    print(json.dumps(result), flush=True)
+    os._exit(0)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="วัดเวลาเปิดโปรแกรมจนถึงการวาดหน้าต่างหลักครั้งแรก")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="จำนวนรอบที่วัด")
+    parser.add_argument("--offscreen", action="store_true", help="ใช้ QT_QPA_PLATFORM=offscreen (เช่นบนเครื่องที่ไม่มีจอ)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child()
+        return
+
+    env = dict(os.environ)
+    if args.offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    root = os.path.dirname(os.path.abspath(__file__))
+
+    samples = []
+    for i in range(args.runs):
+        started = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child"],
+            cwd=root, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        total_ms = (time.perf_counter() - started) * 1000
+        result = json.loads(output.strip().splitlines()[-1])
+        result["total_ms"] = total_ms
+        samples.append(result)
+        print(
+            f"run {i + 1}: process start -> first paint {total_ms:.0f} ms "
+            f"(imports {result['import_ms']:.0f} ms, window {result['construct_ms']:.0f} ms, "
+            f"paint {result['paint_ms']:.0f} ms)"
+        )
+        if result["heavy_modules"]:
+            print(f"  warning: loaded before first paint: {', '.join(result['heavy_modules'])}")
+
+    for key in ("total_ms", "import_ms", "paint_ms"):
+        values = [sample[key] for sample in samples]
+        print(f"{key}: median {statistics.median(values):.0f} ms, min {min(values):.0f} ms, max {max(values):.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,76 @@
-from .auth import DiscordOAuth, TokenValidator
-from .downloader import (
-    ForumDownloader,
-    ChannelDownloader,
-    DownloadWorker,
-    DownloadResumer
-)
-from .api import DownloaderAPI
-from .utils import (
-    load_config,
-    save_config,
-    show_notification,
-    get_guild_channels,
-    is_token_valid,
-    is_in_guild
-)
-
-__all__ = [
-    'DiscordOAuth',
-    'TokenValidator',
-    'ForumDownloader',
-    'ChannelDownloader',
-    'DownloadWorker',
-    'DownloadResumer',
-    'DownloaderAPI',
-    'load_config',
-    'save_config',
-    'show_notification',
-    'get_guild_channels',
-    'is_token_valid',
-    'is_in_guild'
-]
\ No newline at end of file
+import importlib
+from .auth import TokenValidator
+from .downloader import (
+    ForumDownloader,
+    ChannelDownloader,
+    DownloadResumer
+)
+from .manager import DownloadManager
+from .api import DownloaderAPI
+from .ratelimit import RateLimiter, get_rate_limiter
+from .bandwidth import BandwidthLimiter, get_bandwidth_limiter
+from .concurrency import ConcurrencyLimiter
+from .http import DiscordSession, get_session, close_session
+from .checkpoint import CheckpointStore
+from .jobqueue import JobQueue
+from .cache import LookupCache, get_lookup_cache
+from .manifest import ChannelManifest
+from .blobstore import BlobStore
+from .metadata import MetadataSink
+from .utils import (
+    load_config,
+    save_config,
+    show_notification,
+    get_guild_channels,
+    is_token_valid,
+    is_in_guild,
+    invalidate_guild_cache
+)
+
+__all__ = [
+    'DiscordOAuth',
+    'TokenValidator',
+    'ForumDownloader',
+    'ChannelDownloader',
+    'DownloadWorker',
+    'DownloadResumer',
+    'DownloadManager',
+    'DownloaderAPI',
+    'RateLimiter',
+    'get_rate_limiter',
+    'BandwidthLimiter',
+    'get_bandwidth_limiter',
+    'ConcurrencyLimiter',
+    'DiscordSession',
+    'get_session',
+    'close_session',
+    'CheckpointStore',
+    'JobQueue',
+    'LookupCache',
+    'get_lookup_cache',
+    'ChannelManifest',
+    'BlobStore',
+    'MetadataSink',
+    'load_config',
+    'save_config',
+    'show_notification',
+    'get_guild_channels',
+    'is_token_valid',
+    'is_in_guild',
+    'invalidate_guild_cache'
+]
+
+# ส่วนที่ต้องใช้ PyQt6 จะถูก import เมื่อมีการเรียกใช้เท่านั้น
+# เพื่อให้ใช้ core แบบ headless (CLI / server) ได้โดยไม่ต้องติดตั้ง GUI
+_LAZY_IMPORTS = {
+    'DiscordOAuth': '.qt',
+    'DownloadWorker': '.qt'
+}
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,93 +1,375 @@
-from flask import Flask, request, jsonify
-from threading import Thread
-import json
-from datetime import datetime
-from typing import Dict, List
-from .downloader import DownloadWorker
-
-class DownloaderAPI:
-    """
-    REST API สำหรับควบคุมการดาวน์โหลดจากระยะไกล
-    """
-    def __init__(self, download_manager, port: int = 5000):
-        self.app = Flask(__name__)
-        self.port = port
-        self.download_manager = download_manager
-        self._setup_routes()
-
-    def _setup_routes(self) -> None:
-        """
-        กำหนดเส้นทาง API
-        """
-        self.app.add_url_rule('/api/add_download', 'add_download', self.add_download, methods=['POST'])
-        self.app.add_url_rule('/api/status', 'get_status', self.get_status, methods=['GET'])
-        self.app.add_url_rule('/api/stop', 'stop_download', self.stop_download, methods=['POST'])
-        self.app.add_url_rule('/api/queue', 'get_queue', self.get_queue, methods=['GET'])
-
-    def add_download(self) -> Dict:
-        """
-        เพิ่มงานดาวน์โหลดใหม่
-        """
-        data = request.json
-        required_fields = ['channel_id', 'channel_name', 'guild_id']
-        
-        if not all(field in data for field in required_fields):
-            return jsonify({"status": "error", "message": "Missing required fields"}), 400
-        
-        task = {
-            'channel_id': data['channel_id'],
-            'channel_name': data['channel_name'],
-            'guild_id': data['guild_id'],
-            'save_metadata': data.get('save_metadata', True),
-            'scheduled_time': data.get('scheduled_time')
-        }
-        
-        self.download_manager.add_download_task(task)
-        return jsonify({"status": "success", "message": "Download task added"})
-
-    def get_status(self) -> Dict:
-        """
-        รับสถานะการดาวน์โหลดปัจจุบัน
-        """
-        active_downloads = self.download_manager.get_active_downloads()
-        queue = self.download_manager.get_download_queue()
-        
-        return jsonify({
-            "status": "success",
-            "active_downloads": active_downloads,
-            "queue": queue
-        })
-
-    def stop_download(self) -> Dict:
-        """
-        หยุดการดาวน์โหลดปัจจุบัน
-        """
-        data = request.json
-        channel_id = data.get('channel_id')
-        
-        if channel_id:
-            self.download_manager.stop_download(channel_id)
-            return jsonify({"status": "success", "message": f"Download for {channel_id} stopped"})
-        else:
-            self.download_manager.stop_all_downloads()
-            return jsonify({"status": "success", "message": "All downloads stopped"})
-
-    def get_queue(self) -> Dict:
-        """
-        รับรายการคิวดาวน์โหลด
-        """
-        queue = self.download_manager.get_download_queue()
-        return jsonify({"status": "success", "queue": queue})
-
-    def start(self) -> None:
-        """
-        เริ่มเซิร์ฟเวอร์ API
-        """
-        self.app.run(port=self.port, threaded=True)
-
-    def start_in_thread(self) -> None:
-        """
-        เริ่มเซิร์ฟเวอร์ API ใน thread แยก
-        """
-        thread = Thread(target=self.start, daemon=True)
-        thread.start()
\ No newline at end of file
+import json
+import asyncio
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from aiohttp import web, WSMsgType
+
+from .models import DownloadFilter
+from .utils import get_guild_channels, download_channel_type
+
+class DownloaderAPI:
+    """
+    REST API สำหรับควบคุมการดาวน์โหลดจากระยะไกล
+
+    เซิร์ฟเวอร์เป็น aiohttp.web ที่ทำงานบน event loop เดียวกับ DownloadManager
+    จึงไม่สร้าง thread ต่อ request และเพิ่มงานจำนวนมากได้ใน request เดียว
+    งานที่อ่านเขียน JobQueue (SQLite ที่อาจรอ lock ของโปรเซสอื่น) ทำใน thread แยกด้วย asyncio.to_thread
+    เพื่อไม่ให้การดาวน์โหลดและ event stream บน loop เดียวกันต้องหยุดรอ
+    (/api/add_downloads และ /api/add_guild) ส่วน /api/status และ /api/queue
+    แบ่งหน้าด้วย query ?offset=&limit=
+    ความคืบหน้าแบบ push ดูได้จาก /api/events (SSE) หรือ /api/ws (WebSocket)
+    ความเร็วดาวน์โหลดดูและปรับได้ระหว่างทำงานที่ /api/bandwidth
+    จำนวนงานพร้อมกันที่ปรับเองของแต่ละช่องทางดูได้ที่ /api/concurrency
+    """
+    default_page_size = 100
+    max_page_size = 1000
+    keepalive_interval = 15.0  # วินาที
+
+    def __init__(self, download_manager, port: int = 5000, host: str = "127.0.0.1"):
+        self.app = web.Application()
+        self.host = host
+        self.port = port
+        self.download_manager = download_manager
+        self._runner: Optional[web.AppRunner] = None
+        self._setup_routes()
+
+    def _setup_routes(self) -> None:
+        """
+        กำหนดเส้นทาง API
+        """
+        self.app.router.add_post('/api/add_download', self.add_download)
+        self.app.router.add_post('/api/add_downloads', self.add_downloads)
+        self.app.router.add_post('/api/add_guild', self.add_guild)
+        self.app.router.add_get('/api/status', self.get_status)
+        self.app.router.add_post('/api/stop', self.stop_download)
+        self.app.router.add_get('/api/queue', self.get_queue)
+        self.app.router.add_get('/api/events', self.stream_events)
+        self.app.router.add_get('/api/ws', self.stream_events_ws)
+        self.app.router.add_get('/api/bandwidth', self.get_bandwidth)
+        self.app.router.add_post('/api/bandwidth', self.set_bandwidth)
+        self.app.router.add_get('/api/concurrency', self.get_concurrency)
+
+    @staticmethod
+    def _error(message: str, status: int = 400) -> web.Response:
+        return web.json_response({"status": "error", "message": message}, status=status)
+
+    @staticmethod
+    async def _read_json(request: web.Request) -> Dict:
+        if not request.can_read_body:
+            return {}
+        try:
+            data = await request.json()
+        except json.JSONDecodeError:
+            raise web.HTTPBadRequest(
+                text=json.dumps({"status": "error", "message": "Invalid JSON body"}),
+                content_type="application/json"
+            )
+        return data if isinstance(data, dict) else {}
+
+    def _page(self, request: web.Request) -> Tuple[int, int]:
+        """
+        อ่าน offset / limit จาก query string
+        """
+        try:
+            offset = max(int(request.query.get('offset', 0)), 0)
+            limit = int(request.query.get('limit', self.default_page_size))
+        except ValueError:
+            raise web.HTTPBadRequest(
+                text=json.dumps({"status": "error", "message": "offset and limit must be integers"}),
+                content_type="application/json"
+            )
+        return offset, min(max(limit, 1), self.max_page_size)
+
+    @staticmethod
+    def _to_task(data: Dict, defaults: Optional[Dict] = None) -> Dict:
+        """
+        สร้าง dict ของงานจากข้อมูลใน request (ค่าที่ไม่ระบุจะใช้จาก defaults)
+        """
+        data = {**(defaults or {}), **data}
+        required_fields = ['channel_id', 'channel_name', 'guild_id']
+        if not all(field in data for field in required_fields):
+            raise ValueError("Missing required fields")
+        scheduled_time = data.get('scheduled_time')
+        if scheduled_time:
+            scheduled_time = datetime.fromisoformat(scheduled_time)
+        filters = data.get('filters')
+        if filters is not None and not isinstance(filters, dict):
+            raise ValueError("filters must be an object")
+        repeat_interval = data.get('repeat_interval')
+        if repeat_interval is not None:
+            repeat_interval = float(repeat_interval)
+            if repeat_interval <= 0:
+                raise ValueError("repeat_interval must be positive")
+        bandwidth_limit = float(data['bandwidth_limit']) if data.get('bandwidth_limit') else None
+        if bandwidth_limit is not None and bandwidth_limit < 0:
+            raise ValueError("bandwidth_limit must not be negative")
+        return {
+            'channel_id': data['channel_id'],
+            'channel_name': data['channel_name'],
+            'channel_type': data.get('channel_type', 'text'),
+            'guild_id': data['guild_id'],
+            'save_metadata': data.get('save_metadata', True),
+            'incremental': data.get('incremental', False),
+            'priority': int(data.get('priority', 0)),
+            'repeat_interval': repeat_interval,
+            'bandwidth_limit': bandwidth_limit,
+            'scheduled_time': scheduled_time or None,
+            'filters': DownloadFilter.from_dict(filters) if filters else None,
+            'crawl_slices': max(int(data.get('crawl_slices', 1)), 1),
+            'dedup': bool(data.get('dedup', False))
+        }
+
+    async def add_download(self, request: web.Request) -> web.Response:
+        """
+        เพิ่มงานดาวน์โหลดใหม่
+        """
+        try:
+            task = self._to_task(await self._read_json(request))
+        except (ValueError, TypeError) as e:
+            return self._error(str(e))
+
+        if await asyncio.to_thread(self.download_manager.add_download_task, task) is None:
+            return web.json_response({"status": "success", "message": "Download task already queued"})
+        return web.json_response({"status": "success", "message": "Download task added"})
+
+    async def add_downloads(self, request: web.Request) -> web.Response:
+        """
+        เพิ่มงานดาวน์โหลดหลายช่องทางในครั้งเดียว
+
+        body: {"channels": [{...}, ...], ...} โดยคีย์อื่นนอกจาก channels
+        (เช่น guild_id, save_metadata) จะใช้เป็นค่าเริ่มต้นของทุกช่องทาง
+        """
+        data = await self._read_json(request)
+        channels = data.pop('channels', None)
+        if not isinstance(channels, list):
+            return self._error("channels must be a list")
+
+        tasks, errors = [], []
+        for index, channel in enumerate(channels):
+            try:
+                tasks.append(self._to_task(channel, data))
+            except (ValueError, TypeError) as e:
+                errors.append({"index": index, "message": str(e)})
+
+        added = await asyncio.to_thread(self.download_manager.add_download_tasks, tasks)
+        return web.json_response({
+            "status": "success",
+            "added": len(added),
+            "skipped": len(tasks) - len(added),
+            "errors": errors
+        })
+
+    async def add_guild(self, request: web.Request) -> web.Response:
+        """
+        เพิ่มงานดาวน์โหลดทุกช่องทางข้อความและฟอรัมของ Guild
+
+        body: {"guild_id": "...", "channel_types": ["text", "forum"], "exclude": [...], ...}
+        """
+        data = await self._read_json(request)
+        guild_id = data.pop('guild_id', None)
+        if not guild_id:
+            return self._error("Missing required fields")
+        channel_types = data.pop('channel_types', ["text", "forum"])
+        exclude = {str(channel_id) for channel_id in data.pop('exclude', [])}
+
+        try:
+            channels = await get_guild_channels(self.download_manager.token, str(guild_id))
+        except Exception as e:
+            return self._error(str(e), status=502)
+
+        tasks: List[Dict] = []
+        try:
+            for channel in channels:
+                channel_type = download_channel_type(channel)
+                if channel_type in channel_types and str(channel["id"]) not in exclude:
+                    tasks.append(self._to_task({
+                        'channel_id': str(channel["id"]),
+                        'channel_name': channel.get("name") or str(channel["id"]),
+                        'channel_type': channel_type,
+                        'guild_id': str(guild_id)
+                    }, data))
+        except (ValueError, TypeError) as e:
+            return self._error(str(e))
+
+        added = await asyncio.to_thread(self.download_manager.add_download_tasks, tasks)
+        return web.json_response({"status": "success", "added": len(added), "skipped": len(tasks) - len(added)})
+
+    async def get_status(self, request: web.Request) -> web.Response:
+        """
+        รับสถานะการดาวน์โหลดปัจจุบัน (แบ่งหน้า)
+        """
+        offset, limit = self._page(request)
+        return web.json_response({
+            "status": "success",
+            "counts": await asyncio.to_thread(self.download_manager.count_downloads),
+            "offset": offset,
+            "limit": limit,
+            "active_downloads": self.download_manager.get_active_downloads(offset, limit),
+            "queue": await asyncio.to_thread(self.download_manager.get_download_queue, offset, limit)
+        })
+
+    async def stop_download(self, request: web.Request) -> web.Response:
+        """
+        หยุดการดาวน์โหลดปัจจุบัน
+        """
+        data = await self._read_json(request)
+        channel_id = data.get('channel_id')
+
+        if channel_id:
+            await asyncio.to_thread(self.download_manager.stop_download, channel_id)
+            return web.json_response({"status": "success", "message": f"Download for {channel_id} stopped"})
+        else:
+            await asyncio.to_thread(self.download_manager.stop_all_downloads)
+            return web.json_response({"status": "success", "message": "All downloads stopped"})
+
+    async def get_queue(self, request: web.Request) -> web.Response:
+        """
+        รับรายการคิวดาวน์โหลด (แบ่งหน้า)
+        """
+        offset, limit = self._page(request)
+        return web.json_response({
+            "status": "success",
+            "total": (await asyncio.to_thread(self.download_manager.count_downloads))["queued"],
+            "offset": offset,
+            "limit": limit,
+            "queue": await asyncio.to_thread(self.download_manager.get_download_queue, offset, limit)
+        })
+
+    async def get_bandwidth(self, request: web.Request) -> web.Response:
+        """
+        รับการตั้งค่าความเร็วดาวน์โหลดรวมและของแต่ละงานที่กำลังทำ
+        """
+        return web.json_response({"status": "success", **self.download_manager.get_bandwidth()})
+
+    async def set_bandwidth(self, request: web.Request) -> web.Response:
+        """
+        ปรับความเร็วดาวน์โหลด
+
+        body: {"rate": 5000000, "burst": ..., "schedule": [{"start": "09:00", "end": "18:00", "rate": ...}]}
+        (byte ต่อวินาที, null = ไม่จำกัด) ระบุ "channel_id" เพื่อปรับเฉพาะงานที่กำลังทำของช่องทางนั้น
+        """
+        data = await self._read_json(request)
+        channel_id = data.pop('channel_id', None)
+        try:
+            bandwidth = await asyncio.to_thread(self.download_manager.set_bandwidth, data, channel_id)
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            return self._error(f"Invalid bandwidth settings: {e}")
+        except Exception as e:
+            return self._error(str(e), status=404)
+        return web.json_response({"status": "success", "bandwidth": bandwidth})
+
+    async def get_concurrency(self, request: web.Request) -> web.Response:
+        """
+        รับสถานะของตัวปรับจำนวนงานพร้อมกันของแต่ละงานที่กำลังทำ
+        """
+        return web.json_response({"status": "success", "channels": self.download_manager.get_concurrency()})
+
+    @staticmethod
+    def _filter_events(batch: List[Dict], channel_ids: Set[str]) -> List[Dict]:
+        if not channel_ids:
+            return batch
+        return [event for event in batch if event["channel_id"] in channel_ids]
+
+    @staticmethod
+    def _channel_ids(values: Iterable) -> Set[str]:
+        return {str(value) for value in values}
+
+    async def stream_events(self, request: web.Request) -> web.StreamResponse:
+        """
+        ส่งเหตุการณ์ความคืบหน้าแบบ Server-Sent Events (กรองด้วย ?channel_id= ได้หลายค่า)
+        """
+        channel_ids = self._channel_ids(request.query.getall('channel_id', []))
+        response = web.StreamResponse(headers={
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache"
+        })
+        await response.prepare(request)
+
+        queue = self.download_manager.events.subscribe()
+        try:
+            while True:
+                try:
+                    batch = await asyncio.wait_for(queue.get(), self.keepalive_interval)
+                except asyncio.TimeoutError:
+                    await response.write(b": keepalive\n\n")
+                    continue
+                for event in self._filter_events(batch, channel_ids):
+                    await response.write(f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode("utf-8"))
+        except ConnectionResetError:
+            pass
+        finally:
+            self.download_manager.events.unsubscribe(queue)
+        return response
+
+    async def stream_events_ws(self, request: web.Request) -> web.WebSocketResponse:
+        """
+        ส่งเหตุการณ์ความคืบหน้าทาง WebSocket (ข้อความละหนึ่ง batch เป็น JSON list)
+
+        client ส่ง {"channel_ids": [...]} เพื่อเปลี่ยนช่องทางที่ติดตามได้ (list ว่าง = ทั้งหมด)
+        """
+        channel_ids = self._channel_ids(request.query.getall('channel_id', []))
+        ws = web.WebSocketResponse(heartbeat=self.keepalive_interval)
+        await ws.prepare(request)
+
+        queue = self.download_manager.events.subscribe()
+
+        async def send() -> None:
+            while True:
+                events = self._filter_events(await queue.get(), channel_ids)
+                if events:
+                    await ws.send_json(events)
+
+        sender = asyncio.create_task(send())
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    data = json.loads(msg.data)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(data, dict) and isinstance(data.get('channel_ids'), list):
+                    channel_ids.clear()
+                    channel_ids.update(self._channel_ids(data['channel_ids']))
+        finally:
+            sender.cancel()
+            await asyncio.gather(sender, return_exceptions=True)
+            self.download_manager.events.unsubscribe(queue)
+        return ws
+
+    async def serve(self) -> None:
+        """
+        เริ่มเซิร์ฟเวอร์บน event loop ปัจจุบัน
+        """
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def close(self) -> None:
+        """
+        ปิดเซิร์ฟเวอร์
+        """
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start(self) -> None:
+        """
+        เริ่มเซิร์ฟเวอร์ API บน event loop ของ DownloadManager (ไม่บล็อก thread ที่เรียก)
+        """
+        self.download_manager.start()
+        self.download_manager.run_coroutine(self.serve()).result()
+
+    def start_in_thread(self) -> None:
+        """
+        เริ่มเซิร์ฟเวอร์ API (คงไว้เพื่อความเข้ากันได้ เซิร์ฟเวอร์ทำงานใน thread ของ DownloadManager อยู่แล้ว)
+        """
+        self.start()
+
+    def stop(self) -> None:
+        """
+        ปิดเซิร์ฟเวอร์ API
+        """
+        if self.download_manager.loop is not None:
+            self.download_manager.run_coroutine(self.close()).result()
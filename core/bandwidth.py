@@ -0,0 +1,132 @@
+import time
+import asyncio
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+class BandwidthLimiter:
+    """
+    จำกัดความเร็วดาวน์โหลดด้วย token bucket (หน่วย byte ต่อวินาที)
+
+    ทุก chunk ที่อ่านจาก CDN ต้องเรียก consume() ก่อนอ่าน chunk ถัดไป ถ้า token ไม่พอจะรอจนกว่าจะพอ
+    rate=None คือไม่จำกัด ส่วน schedule กำหนดความเร็วตามช่วงเวลาของวัน (เวลาท้องถิ่น) เช่น
+    [{"start": "09:00", "end": "18:00", "rate": 5000000}] ช่วงที่ end น้อยกว่า start คือข้ามเที่ยงคืน
+    นอกช่วงใน schedule จะใช้ rate ปกติ ปรับค่าได้ระหว่างทำงานด้วย configure()
+    ใช้ threading.Lock เหมือน RateLimiter เพื่อใช้ร่วมกันได้ระหว่างหลาย event loop / thread
+    """
+    _UNCHANGED = object()
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None, schedule: Optional[List[Dict]] = None):
+        self._lock = threading.Lock()
+        self.rate: Optional[float] = None
+        self.burst: Optional[float] = None
+        self.schedule: List[Dict] = []
+        self._tokens = 0.0
+        self._updated_at = time.monotonic()
+        self.configure(rate=rate, burst=burst, schedule=schedule or [])
+
+    @staticmethod
+    def _parse_time(value: str) -> int:
+        hours, minutes = value.split(":")
+        return int(hours) * 60 + int(minutes)
+
+    @staticmethod
+    def _validate_rate(value, name: str = "rate") -> Optional[float]:
+        if not value:
+            return None
+        value = float(value)
+        if value < 0:
+            raise ValueError(f"{name} must not be negative: {value}")
+        return value
+
+    @classmethod
+    def _validate_schedule(cls, schedule: List[Dict]) -> List[Dict]:
+        windows = []
+        for window in schedule:
+            cls._parse_time(window["start"])
+            cls._parse_time(window["end"])
+            windows.append({"start": window["start"], "end": window["end"], "rate": cls._validate_rate(window.get("rate"))})
+        return windows
+
+    def configure(self, rate=_UNCHANGED, burst=_UNCHANGED, schedule=_UNCHANGED) -> None:
+        """
+        เปลี่ยนความเร็ว, ขนาด burst หรือ schedule (ค่าที่ไม่ส่งมาจะคงเดิม)
+
+        ค่าติดลบจะถูกปฏิเสธด้วย ValueError โดยไม่เปลี่ยนค่าใดเลย
+        """
+        schedule = self._validate_schedule(schedule) if schedule is not self._UNCHANGED else self._UNCHANGED
+        rate = self._validate_rate(rate) if rate is not self._UNCHANGED else self._UNCHANGED
+        burst = self._validate_rate(burst, "burst") if burst is not self._UNCHANGED else self._UNCHANGED
+        with self._lock:
+            if rate is not self._UNCHANGED:
+                self.rate = rate
+            if burst is not self._UNCHANGED:
+                self.burst = burst
+            if schedule is not self._UNCHANGED:
+                self.schedule = schedule
+            self._tokens = min(self._tokens, self._capacity(self.current_rate()))
+
+    def current_rate(self, now: Optional[datetime] = None) -> Optional[float]:
+        """
+        ความเร็วที่ใช้อยู่ตอนนี้ตาม schedule (None = ไม่จำกัด)
+        """
+        if not self.schedule:
+            return self.rate
+        now = now or datetime.now()
+        minute = now.hour * 60 + now.minute
+        for window in self.schedule:
+            start, end = self._parse_time(window["start"]), self._parse_time(window["end"])
+            inside = start <= minute < end if start <= end else (minute >= start or minute < end)
+            if inside:
+                return window["rate"]
+        return self.rate
+
+    def _capacity(self, rate: Optional[float]) -> float:
+        if not rate:
+            return 0.0
+        return self.burst or rate  # ค่าเริ่มต้น burst = ข้อมูล 1 วินาที
+
+    def _reserve(self, nbytes: int) -> float:
+        """
+        หัก token สำหรับ nbytes คืนค่าเวลาที่ต้องรอ (token ติดลบได้ ผู้เรียกถัดไปจึงต้องรอต่อคิว)
+        """
+        rate = self.current_rate()
+        with self._lock:
+            now = time.monotonic()
+            elapsed, self._updated_at = now - self._updated_at, now
+            if not rate:
+                self._tokens = 0.0
+                return 0.0
+            self._tokens = min(self._tokens + elapsed * rate, self._capacity(rate))
+            self._tokens -= nbytes
+            return -self._tokens / rate if self._tokens < 0 else 0.0
+
+    async def consume(self, nbytes: int) -> None:
+        """
+        รอจนกว่าจะส่งข้อมูล nbytes ได้ตามความเร็วที่กำหนด
+        """
+        if not self.schedule and not self.rate:
+            return
+        wait = self._reserve(nbytes)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    @property
+    def limited(self) -> bool:
+        return bool(self.rate or self.schedule)
+
+    def status(self) -> Dict:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "schedule": self.schedule,
+            "current_rate": self.current_rate()
+        }
+
+_default_bandwidth_limiter = BandwidthLimiter()
+
+def get_bandwidth_limiter() -> BandwidthLimiter:
+    """
+    คืนค่าตัวจำกัดความเร็วรวมที่ใช้ร่วมกันทั้งโปรเซส (ค่าเริ่มต้นไม่จำกัด)
+    """
+    return _default_bandwidth_limiter
@@ -0,0 +1,66 @@
+import os
+import shutil
+from typing import Optional
+
+from .storage import SQLiteStore
+
+class BlobStore(SQLiteStore):
+    """
+    ที่เก็บไฟล์แบบ content-addressed (ใช้ SHA-256 เป็น key) สำหรับทุกช่องทาง
+
+    ไฟล์ที่มีเนื้อหาเหมือนกันจะถูกเก็บไว้เพียงชุดเดียวใน .blobs/ab/abcdef...
+    แล้ว hardlink (หรือคัดลอกถ้า hardlink ไม่ได้) ไปยังโฟลเดอร์ของแต่ละช่องทาง
+    และจำ ID ของไฟล์แนบไว้ เพื่อข้ามการดาวน์โหลดไฟล์แนบที่เคยดาวน์โหลดแล้วจากช่องทางอื่น
+    """
+    def __init__(self, root: str = os.path.join("DOWNLOADS", ".blobs")):
+        os.makedirs(root, exist_ok=True)
+        super().__init__(os.path.join(root, "index.db"))
+        self.root = root
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS attachments (id TEXT PRIMARY KEY, sha256 TEXT NOT NULL)"
+        )
+
+    def blob_path(self, sha256: str) -> str:
+        """
+        คืนค่า path ของ blob จาก hash
+        """
+        return os.path.join(self.root, sha256[:2], sha256)
+
+    def lookup(self, attachment_id: str) -> Optional[str]:
+        """
+        คืนค่า hash ของไฟล์แนบที่เคยเก็บไว้แล้ว (None ถ้าไม่มีหรือ blob หายไป)
+        """
+        row = self._connect().execute(
+            "SELECT sha256 FROM attachments WHERE id = ?", (str(attachment_id),)
+        ).fetchone()
+        if row and os.path.exists(self.blob_path(row[0])):
+            return row[0]
+        return None
+
+    def ingest(self, src_path: str, sha256: str, attachment_id: Optional[str] = None) -> str:
+        """
+        ย้ายไฟล์ที่ดาวน์โหลดเสร็จเข้า store (ถ้ามี blob เดียวกันอยู่แล้วจะลบไฟล์ซ้ำทิ้ง)
+        """
+        blob_path = self.blob_path(sha256)
+        if os.path.exists(blob_path):
+            os.unlink(src_path)
+        else:
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            os.replace(src_path, blob_path)
+        if attachment_id is not None:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO attachments (id, sha256) VALUES (?, ?)", (str(attachment_id), sha256)
+            )
+        return blob_path
+
+    def link(self, sha256: str, dest_path: str) -> None:
+        """
+        สร้างไฟล์ที่ dest_path ชี้ไปยัง blob (hardlink หรือคัดลอกถ้าอยู่คนละ filesystem)
+        """
+        blob_path = self.blob_path(sha256)
+        tmp_path = f"{dest_path}.{sha256[:8]}.link"
+        try:
+            os.link(blob_path, tmp_path)
+        except OSError:
+            shutil.copy2(blob_path, tmp_path)
+        os.replace(tmp_path, dest_path)
@@ -0,0 +1,83 @@
+import json
+import time
+import hashlib
+from typing import Any, Optional
+
+from .storage import SQLiteStore
+
+class LookupCache(SQLiteStore):
+    """
+    cache แบบมีอายุ (TTL) สำหรับผลการเรียก API ที่เปลี่ยนไม่บ่อย
+
+    เช่น ผลตรวจ token, รายการ guild ของ token และรายการช่องทางของ guild
+    เก็บลงดิสก์จึงใช้ต่อได้ระหว่างการเปิดโปรแกรมแต่ละครั้ง และมี index ตาม guild_id
+    สำหรับล้างข้อมูลของ guild เดียวได้ทันที
+    """
+    def __init__(self, path: str = "cache.db"):
+        super().__init__(path)
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "namespace TEXT NOT NULL, "
+            "key TEXT NOT NULL, "
+            "guild_id TEXT, "
+            "value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        self._connect().execute("CREATE INDEX IF NOT EXISTS entries_guild ON entries (guild_id)")
+
+    @staticmethod
+    def token_key(token: str) -> str:
+        """
+        แปลง token เป็น key (ไม่เก็บ token จริงลงดิสก์)
+        """
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """
+        อ่านค่าจาก cache (None ถ้าไม่มีหรือหมดอายุแล้ว)
+        """
+        row = self._connect().execute(
+            "SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float, guild_id: Optional[str] = None) -> None:
+        """
+        บันทึกค่าลง cache พร้อมอายุ ttl วินาที
+        """
+        self._connect().execute(
+            "INSERT OR REPLACE INTO entries (namespace, key, guild_id, value, expires_at) VALUES (?, ?, ?, ?, ?)",
+            (namespace, key, str(guild_id) if guild_id is not None else None, json.dumps(value), time.time() + ttl)
+        )
+
+    def invalidate(self, namespace: Optional[str] = None, key: Optional[str] = None, guild_id: Optional[str] = None) -> None:
+        """
+        ล้าง cache ตาม namespace / key / guild_id (ไม่ระบุอะไรเลย = ล้างทั้งหมด)
+        """
+        conditions, params = [], []
+        for column, value in (("namespace", namespace), ("key", key), ("guild_id", guild_id)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(str(value))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        self._connect().execute(f"DELETE FROM entries{where}", params)
+
+    def purge_expired(self) -> None:
+        """
+        ลบรายการที่หมดอายุแล้ว
+        """
+        self._connect().execute("DELETE FROM entries WHERE expires_at < ?", (time.time(),))
+
+_default_cache: Optional[LookupCache] = None
+
+def get_lookup_cache() -> LookupCache:
+    """
+    คืนค่า cache ที่ใช้ร่วมกันทั้งโปรเซส
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = LookupCache()
+    return _default_cache
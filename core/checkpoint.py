@@ -0,0 +1,111 @@
+import json
+import time
+import threading
+from typing import Dict, Optional
+
+from .storage import SQLiteStore
+
+class CheckpointStore(SQLiteStore):
+    """
+    ที่เก็บ checkpoint แบบ append-only บน SQLite (WAL)
+
+    การบันทึกแต่ละครั้งเป็นเพียงการเพิ่มแถวใหม่ (ไม่ต้องอ่าน/เขียนทั้งไฟล์)
+    ค่าที่โหลดกลับมาคือการรวม dict ทุกแถวของ key นั้นตามลำดับ
+    และจะบีบอัด (compact) journal ให้เหลือแถวเดียวต่อ key ทุก ๆ compact_every ครั้ง
+    โหมด WAL ทำให้หลาย worker / หลายโปรเซสเขียนพร้อมกันได้อย่างปลอดภัย
+    """
+    def __init__(self, path: str = "download_state.db", compact_every: int = 1000):
+        super().__init__(path)
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._appends = 0
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS journal ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "key TEXT NOT NULL, "
+            "data TEXT NOT NULL, "
+            "ts REAL NOT NULL)"
+        )
+        self._connect().execute("CREATE INDEX IF NOT EXISTS journal_key ON journal (key, seq)")
+
+    def append(self, key: str, data: Dict) -> None:
+        """
+        เพิ่มรายการ checkpoint ของ key (บันทึกเฉพาะฟิลด์ที่เปลี่ยนก็ได้)
+        """
+        self._connect().execute(
+            "INSERT INTO journal (key, data, ts) VALUES (?, ?, ?)",
+            (key, json.dumps(data, ensure_ascii=False), time.time())
+        )
+        with self._lock:
+            self._appends += 1
+            should_compact = self.compact_every and self._appends >= self.compact_every
+            if should_compact:
+                self._appends = 0
+        if should_compact:
+            self.compact()
+
+    def _merge(self, rows) -> Dict[str, Dict]:
+        merged: Dict[str, Dict] = {}
+        for key, data, ts in rows:
+            entry = merged.setdefault(key, {})
+            entry.update(json.loads(data))
+            entry["_updated_at"] = ts
+        return merged
+
+    def load(self, key: str, max_age: Optional[float] = None) -> Optional[Dict]:
+        """
+        โหลด checkpoint ล่าสุดของ key (คืนค่า None ถ้าไม่มีหรือเก่ากว่า max_age วินาที)
+        """
+        rows = self._connect().execute(
+            "SELECT key, data, ts FROM journal WHERE key = ? ORDER BY seq", (key,)
+        ).fetchall()
+        return self._filter_age(self._merge(rows), max_age).get(key)
+
+    def load_all(self, max_age: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        โหลด checkpoint ล่าสุดของทุก key
+        """
+        rows = self._connect().execute("SELECT key, data, ts FROM journal ORDER BY seq").fetchall()
+        return self._filter_age(self._merge(rows), max_age)
+
+    @staticmethod
+    def _filter_age(merged: Dict[str, Dict], max_age: Optional[float]) -> Dict[str, Dict]:
+        now = time.time()
+        result = {}
+        for key, entry in merged.items():
+            updated_at = entry.pop("_updated_at")
+            if max_age is None or now - updated_at < max_age:
+                result[key] = entry
+        return result
+
+    def clear(self, key: Optional[str] = None) -> None:
+        """
+        ลบ checkpoint ของ key (หรือทั้งหมดถ้าไม่ระบุ key)
+        """
+        if key is None:
+            self._connect().execute("DELETE FROM journal")
+        else:
+            self._connect().execute("DELETE FROM journal WHERE key = ?", (key,))
+
+    def compact(self) -> None:
+        """
+        รวมแถวของแต่ละ key ให้เหลือแถวเดียว แล้ว checkpoint ไฟล์ WAL
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute("SELECT key, data, ts FROM journal ORDER BY seq").fetchall()
+            latest_ts = {key: ts for key, _, ts in rows}
+            merged = self._merge(rows)
+            conn.execute("DELETE FROM journal")
+            for key, entry in merged.items():
+                entry.pop("_updated_at", None)
+                conn.execute(
+                    "INSERT INTO journal (key, data, ts) VALUES (?, ?, ?)",
+                    (key, json.dumps(entry, ensure_ascii=False), latest_ts[key])
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
@@ -0,0 +1,185 @@
+import sys
+import asyncio
+import argparse
+from typing import Dict, List, Optional
+
+from .manager import DownloadManager
+from .models import DownloadTask, DownloadFilter
+from .http import close_session
+from .bandwidth import get_bandwidth_limiter
+from .utils import load_config, get_guild_channels, is_token_valid, is_in_guild, download_channel_type
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m core",
+        description="ดาวน์โหลดไฟล์แนบจาก Discord แบบไม่มี GUI"
+    )
+    parser.add_argument("-c", "--config", default="config.json", help="ไฟล์ config (ค่าเริ่มต้น: config.json)")
+    parser.add_argument("--token", help="Discord token (แทนค่าใน config)")
+    parser.add_argument("--guild-id", help="ID ของ Guild (แทนค่าใน config)")
+    parser.add_argument("--channel", action="append", default=[], metavar="ID", help="ช่องทางข้อความที่จะดาวน์โหลด (ระบุซ้ำได้)")
+    parser.add_argument("--forum", action="append", default=[], metavar="ID", help="ช่องทางฟอรัมที่จะดาวน์โหลด (ระบุซ้ำได้)")
+    parser.add_argument("--guild", action="store_true", help="ดาวน์โหลดทุกช่องทางข้อความและฟอรัมใน Guild")
+    parser.add_argument("--incremental", action="store_true", help="ดึงเฉพาะข้อความใหม่กว่าครั้งล่าสุด")
+    parser.add_argument("--no-metadata", action="store_true", help="ไม่บันทึก metadata ของข้อความ")
+    parser.add_argument("--max-active-channels", type=int, help="จำนวนช่องทางที่ดาวน์โหลดพร้อมกัน")
+    parser.add_argument("--max-concurrent-downloads", type=int, help="จำนวนไฟล์ที่ดาวน์โหลดพร้อมกันรวมทุกช่องทาง")
+    parser.add_argument("--bandwidth-limit", type=float, metavar="BYTES", help="จำกัดความเร็วดาวน์โหลดรวม (byte ต่อวินาที)")
+    parser.add_argument("--after", metavar="DATE", help="เฉพาะข้อความหลังวันที่นี้ (ISO 8601 เช่น 2024-01-31)")
+    parser.add_argument("--before", metavar="DATE", help="เฉพาะข้อความก่อนวันที่นี้ (ISO 8601)")
+    parser.add_argument("--days", type=float, help="เฉพาะข้อความ N วันล่าสุด")
+    parser.add_argument("--ext", action="append", default=[], metavar="EXT", help="เฉพาะไฟล์นามสกุลนี้ (ระบุซ้ำได้)")
+    parser.add_argument("--content-type", action="append", default=[], metavar="TYPE", help="เฉพาะไฟล์ชนิดนี้ เช่น video/* (ระบุซ้ำได้)")
+    parser.add_argument("--min-size", type=int, metavar="BYTES", help="เฉพาะไฟล์ที่ใหญ่อย่างน้อยเท่านี้")
+    parser.add_argument("--max-size", type=int, metavar="BYTES", help="เฉพาะไฟล์ที่ไม่ใหญ่เกินนี้")
+    parser.add_argument("--author", action="append", default=[], metavar="ID", help="เฉพาะข้อความจากผู้ส่งนี้ (ระบุซ้ำได้)")
+    parser.add_argument("--dedup", action="store_true", help="เก็บไฟล์ซ้ำข้ามช่องทางเพียงชุดเดียว (BlobStore)")
+    parser.add_argument("--slices", type=int, metavar="N", help="แบ่งประวัติของแต่ละช่องทางเป็น N ช่วงเวลาแล้วดึงพร้อมกัน")
+    parser.add_argument("--interval", type=float, default=5.0, help="ช่วงเวลาแสดงความคืบหน้า (วินาที)")
+    return parser
+
+def _entries(items: List) -> List[Dict]:
+    """
+    แปลงรายการช่องทางใน config (ID หรือ dict ที่มี id / name) เป็น dict
+    """
+    return [item if isinstance(item, dict) else {"id": str(item)} for item in items]
+
+async def resolve_tasks(config: Dict) -> List[DownloadTask]:
+    """
+    ตรวจสอบ token และสร้างรายการงานจาก config (ดึงชื่อช่องทางจาก Guild เมื่อจำเป็น)
+    """
+    token, guild_id = config["token"], str(config["guild_id"])
+    try:
+        if not await is_token_valid(token):
+            raise Exception("Invalid token")
+        if not await is_in_guild(token, guild_id):
+            raise Exception(f"Token is not a member of guild {guild_id}")
+
+        wanted = [(entry, "text") for entry in _entries(config.get("channels", []))]
+        wanted += [(entry, "forum") for entry in _entries(config.get("forums", []))]
+        channels: Dict[str, Dict] = {}
+        if config.get("whole_guild") or any("name" not in entry for entry, _ in wanted):
+            channels = {str(channel["id"]): channel for channel in await get_guild_channels(token, guild_id)}
+    finally:
+        await close_session()
+
+    if config.get("whole_guild"):
+        for channel in channels.values():
+            channel_type = download_channel_type(channel)
+            if channel_type:
+                wanted.append(({"id": channel["id"]}, channel_type))
+
+    tasks, seen = [], set()
+    default_filters = config.get("filters") or {}
+    for entry, channel_type in wanted:
+        channel_id = str(entry["id"])
+        if channel_id in seen:
+            continue
+        seen.add(channel_id)
+        channel = channels.get(channel_id, {})
+        if download_channel_type(channel) == "forum":
+            channel_type = "forum"
+        filters = {**default_filters, **(entry.get("filters") or {})}
+        tasks.append(DownloadTask(
+            channel_id=channel_id,
+            channel_name=entry.get("name") or channel.get("name") or channel_id,
+            channel_type=channel_type,
+            guild_id=guild_id,
+            save_metadata=config.get("save_metadata", True),
+            incremental=config.get("incremental", False),
+            bandwidth_limit=entry.get("bandwidth_limit"),
+            filters=DownloadFilter.from_dict(filters) if filters else None,
+            crawl_slices=max(int(entry.get("crawl_slices", config.get("crawl_slices", 1))), 1),
+            dedup=config.get("dedup", False)
+        ))
+    return tasks
+
+def _print_progress(manager: DownloadManager) -> None:
+    for task in manager.get_active_downloads():
+        print(f"[{task['channel_name']}] {task['downloaded_files']}/{task['total_files']} ({task['progress']:.1f}%)")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    config = load_config(args.config)
+    if args.token:
+        config["token"] = args.token
+    if args.guild_id:
+        config["guild_id"] = args.guild_id
+    if args.channel:
+        config["channels"] = args.channel
+    if args.forum:
+        config["forums"] = args.forum
+    if args.guild:
+        config["whole_guild"] = True
+    if args.incremental:
+        config["incremental"] = True
+    if args.no_metadata:
+        config["save_metadata"] = False
+    if args.max_active_channels:
+        config["max_active_channels"] = args.max_active_channels
+    if args.max_concurrent_downloads:
+        config["max_concurrent_downloads"] = args.max_concurrent_downloads
+    if args.bandwidth_limit:
+        config["bandwidth_limit"] = args.bandwidth_limit
+    if args.slices:
+        config["crawl_slices"] = args.slices
+    if args.dedup:
+        config["dedup"] = True
+    filters = {
+        "after": args.after, "before": args.before, "days": args.days,
+        "extensions": args.ext, "content_types": args.content_type,
+        "min_size": args.min_size, "max_size": args.max_size, "authors": args.author
+    }
+    filters = {key: value for key, value in filters.items() if value not in (None, [])}
+    if filters:
+        config["filters"] = {**(config.get("filters") or {}), **filters}
+
+    if not config.get("token") or not config.get("guild_id"):
+        print("Error: token and guild_id are required (config file or --token / --guild-id)", file=sys.stderr)
+        return 2
+
+    try:
+        tasks = asyncio.run(resolve_tasks(config))
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if not tasks:
+        print("Nothing to download (use --channel, --forum or --guild)", file=sys.stderr)
+        return 2
+
+    try:
+        get_bandwidth_limiter().configure(
+            rate=config.get("bandwidth_limit"),
+            schedule=config.get("bandwidth_schedule", [])
+        )
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        print(f"Error: invalid bandwidth settings: {e}", file=sys.stderr)
+        return 2
+
+    manager = DownloadManager(
+        config["token"],
+        max_active_channels=config.get("max_active_channels", 4),
+        max_concurrent_downloads=config.get("max_concurrent_downloads", 16),
+        per_channel_downloads=config.get("per_channel_downloads", 5)
+    )
+    added = manager.add_download_tasks(tasks)
+    print(f"Downloading {len(tasks)} channel(s)... ({len(tasks) - len(added)} already queued)")
+
+    manager.start()
+    try:
+        while not manager.wait(args.interval):
+            _print_progress(manager)
+    except KeyboardInterrupt:
+        print("Stopping... (unfinished channels stay queued and resume on the next run)")
+    finally:
+        manager.shutdown()
+
+    # ผลล่าสุดของแต่ละช่องทาง (งานที่ลองใหม่แล้วจะแทนผลครั้งก่อน)
+    results = {task['channel_id']: task for task in manager.get_finished_downloads()}
+    failed = 0
+    for task in results.values():
+        print(f"{task['status']:>9}  {task['channel_name']}  ({task['downloaded_files']} files)")
+        # งานที่ไม่ completed นับเป็นล้มเหลว รวมถึงงานที่ล้มเหลวแล้วถูกตั้งเวลาลองใหม่ (pending)
+        # เพราะโหมดนี้ไม่รอรอบลองใหม่ (จะถูกทำต่อเมื่อเรียกคำสั่งนี้ครั้งถัดไป)
+        failed += task['status'] != "completed"
+    return 1 if failed else 0
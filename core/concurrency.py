@@ -0,0 +1,169 @@
+import time
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+
+import aiohttp
+
+class ConcurrencySlot:
+    """
+    สิทธิ์ทำงานหนึ่งช่องของ ConcurrencyLimiter ใช้รายงานผลของ request ที่ทำในช่องนี้
+    """
+    def __init__(self, limiter: 'ConcurrencyLimiter', round_id: int):
+        self._limiter = limiter
+        self.round_id = round_id
+
+    def record(self, resp: aiohttp.ClientResponse, latency: float) -> None:
+        """
+        รายงาน response (latency = เวลาจนได้รับ header)
+        """
+        self._limiter._record(self.round_id, resp.status, latency)
+
+    def failed(self, error: BaseException) -> None:
+        """
+        รายงานข้อผิดพลาด (ลดจำนวนงานพร้อมกันเฉพาะข้อผิดพลาดของเครือข่าย)
+        """
+        if isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError)):
+            self._limiter._backoff(self.round_id, type(error).__name__)
+
+class ConcurrencyLimiter:
+    """
+    จำกัดจำนวน request ที่ทำพร้อมกันแบบปรับตัวเอง (AIMD)
+
+    ทำงานเป็นรอบ รอบละ limit request เมื่อจบรอบที่ใช้ช่องเต็มทุกช่องและ throughput
+    ไม่ลดลง จะเพิ่ม limit ทีละ increase (additive increase) ส่วน 429, 5xx, ข้อผิดพลาดของเครือข่าย
+    หรือ latency เฉลี่ยของรอบสูงกว่า baseline เกิน latency_tolerance เท่า จะคูณ limit ด้วย
+    decrease_factor ทันที (multiplicative decrease) และเริ่มรอบใหม่ ผลของ request ที่เริ่มก่อน
+    การลดครั้งล่าสุดจะไม่ถูกนับซ้ำ
+    ดูสถานะได้จาก status() ต้องเรียกจาก thread ของ event loop เท่านั้น
+    """
+    increase = 1.0
+    decrease_factor = 0.5
+    latency_tolerance = 2.0      # เท่าของ baseline ที่ถือว่า latency พุ่ง
+    throughput_tolerance = 0.05  # throughput ลดลงไม่เกินสัดส่วนนี้ยังเพิ่ม limit ได้
+    baseline_drift = 1.05        # baseline ขยับขึ้นทุกรอบ เผื่อเครือข่ายช้าลงถาวร
+
+    def __init__(self, initial: int = 2, min_limit: int = 1, max_limit: int = 16):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        self.latency: Optional[float] = None  # ค่าเฉลี่ยถ่วงน้ำหนัก (วินาที)
+        self.baseline_latency: Optional[float] = None
+        self.throughput = 0.0  # byte ต่อวินาทีของรอบล่าสุด
+        self.backoffs = 0
+        self.last_backoff: Optional[str] = None
+
+        self._round = 0
+        self._new_round()
+
+    def _new_round(self) -> None:
+        self._round_started = time.monotonic()
+        self._round_samples = 0
+        self._round_latency = 0.0
+        self._round_bytes = 0
+        self._round_saturated = False
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        รอจนได้ช่องว่างแล้วทำงานในช่องนั้น: async with limiter.slot() as slot
+        """
+        await self._acquire()
+        slot = ConcurrencySlot(self, self._round)
+        try:
+            yield slot
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            slot.failed(e)
+            raise
+        finally:
+            self.in_flight -= 1
+            self._wake()
+
+    async def _acquire(self) -> None:
+        while self.in_flight >= int(self.limit):
+            self._round_saturated = True
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                else:
+                    self._wake()  # ส่งสิทธิ์ที่ได้รับต่อให้ตัวที่รออยู่
+                raise
+        self.in_flight += 1
+        if self.in_flight >= int(self.limit):
+            self._round_saturated = True
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def transferred(self, nbytes: int) -> None:
+        """
+        บันทึกจำนวน byte ที่รับได้ (ใช้คำนวณ throughput ของรอบ)
+        """
+        self._round_bytes += nbytes
+
+    def _record(self, round_id: int, status: int, latency: float) -> None:
+        if status == 429 or status >= 500:
+            self._backoff(round_id, f"HTTP {status}")
+            return
+        if round_id != self._round:
+            return
+        self.latency = latency if self.latency is None else self.latency * 0.8 + latency * 0.2
+        self._round_samples += 1
+        self._round_latency += latency
+        if self._round_samples >= int(self.limit):
+            self._end_round()
+
+    def _end_round(self) -> None:
+        elapsed = max(time.monotonic() - self._round_started, 1e-6)
+        throughput = self._round_bytes / elapsed
+        latency = self._round_latency / self._round_samples
+        if self.baseline_latency is None:
+            self.baseline_latency = latency
+        else:
+            self.baseline_latency = min(self.baseline_latency * self.baseline_drift, latency)
+
+        if latency > self.baseline_latency * self.latency_tolerance:
+            self._backoff(self._round, "latency")
+            return
+        if self._round_saturated and throughput >= self.throughput * (1 - self.throughput_tolerance):
+            self.limit = min(self.limit + self.increase, float(self.max_limit))
+            self._wake()
+        self.throughput = throughput
+        self._round += 1
+        self._new_round()
+
+    def _backoff(self, round_id: int, reason: str) -> None:
+        if round_id != self._round:
+            return  # request นี้เริ่มก่อนการลดครั้งล่าสุด
+        self.limit = max(self.limit * self.decrease_factor, float(self.min_limit))
+        self.backoffs += 1
+        self.last_backoff = reason
+        self._round += 1
+        self._new_round()
+
+    def status(self) -> Dict:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "latency": self.latency,
+            "baseline_latency": self.baseline_latency,
+            "throughput": self.throughput,
+            "backoffs": self.backoffs,
+            "last_backoff": self.last_backoff
+        }
@@ -1,313 +1,1008 @@
-import os
-import json
-import aiohttp
-import asyncio
-from datetime import datetime
-from pathlib import Path
-from typing import Dict, List, Optional
-from PyQt6.QtCore import QThread, pyqtSignal
-
-class DownloadResumer:
-    """
-    ระบบ Resume การดาวน์โหลด
-    """
-    def __init__(self, state_file: str = "download_state.json"):
-        self.state_file = state_file
-
-    def save_state(self, download_state: Dict) -> None:
-        """
-        บันทึกสถานะการดาวน์โหลดปัจจุบัน
-        """
-        try:
-            with open(self.state_file, "w") as f:
-                json.dump({
-                    "timestamp": datetime.now().isoformat(),
-                    "downloads": download_state
-                }, f, indent=2)
-        except Exception as e:
-            print(f"Failed to save download state: {e}")
-
-    def load_state(self) -> Optional[Dict]:
-        """
-        โหลดสถานะการดาวน์โหลดที่บันทึกไว้
-        """
-        try:
-            if Path(self.state_file).exists():
-                with open(self.state_file, "r") as f:
-                    state = json.load(f)
-                    # ตรวจสอบว่าสถานะไม่เก่าเกินไป (เช่น 24 ชม.)
-                    last_updated = datetime.fromisoformat(state["timestamp"])
-                    if (datetime.now() - last_updated).total_seconds() < 86400:
-                        return state["downloads"]
-        except Exception as e:
-            print(f"Failed to load download state: {e}")
-        return None
-
-    def clear_state(self) -> None:
-        """
-        ลบไฟล์สถานะการดาวน์โหลด
-        """
-        try:
-            Path(self.state_file).unlink(missing_ok=True)
-        except Exception as e:
-            print(f"Failed to clear download state: {e}")
-
-class DownloadWorker(QThread):
-    """
-    Worker สำหรับดาวน์โหลดไฟล์ใน Thread แยก
-    """
-    progress_updated = pyqtSignal(int, int, str)  # current, total, message
-    download_complete = pyqtSignal(str)           # channel_name
-    error_occurred = pyqtSignal(str)             # error_message
-
-    def __init__(self, token: str, guild_id: str, channel_id: str, channel_name: str, save_metadata: bool = True):
-        super().__init__()
-        self.token = token
-        self.guild_id = guild_id
-        self.channel_id = channel_id
-        self.channel_name = channel_name
-        self.save_metadata = save_metadata
-        self.resumer = DownloadResumer()
-        self.state = self._load_resume_state()
-        self._is_running = True
-
-    def _load_resume_state(self) -> Optional[Dict]:
-        """
-        โหลดสถานะการดาวน์โหลดที่ค้างไว้
-        """
-        state = self.resumer.load_state()
-        if state and str(self.channel_id) in state:
-            return state[str(self.channel_id)]
-        return None
-
-    def _save_resume_state(self, progress: Dict) -> None:
-        """
-        บันทึกสถานะการดาวน์โหลดปัจจุบัน
-        """
-        state = self.resumer.load_state() or {}
-        state[str(self.channel_id)] = progress
-        self.resumer.save_state(state)
-
-    def stop(self) -> None:
-        """
-        หยุดการดาวน์โหลด
-        """
-        self._is_running = False
-
-    def run(self) -> None:
-        """
-        เริ่มการดาวน์โหลด
-        """
-        try:
-            asyncio.run(self._download())
-        except Exception as e:
-            self.error_occurred.emit(f"Error downloading {self.channel_name}: {str(e)}")
-        finally:
-            self.resumer.clear_state()
-
-    async def _download(self) -> None:
-        """
-        ดาวน์โหลดไฟล์จากช่องทาง
-        """
-        try:
-            downloader = ChannelDownloader(self.token, self.guild_id, self.save_metadata)
-            start_from = self.state["last_message_id"] if self.state else None
-
-            async with aiohttp.ClientSession() as session:
-                await downloader.download_attachments_from_channel(
-                    session,
-                    self.channel_id,
-                    self.channel_name,
-                    progress_callback=self._update_progress,
-                    start_from=start_from
-                )
-
-            self.download_complete.emit(f"Download complete: {self.channel_name}")
-        except Exception as e:
-            self.error_occurred.emit(f"Error downloading {self.channel_name}: {str(e)}")
-
-    def _update_progress(self, current: int, total: int, message: str) -> None:
-        """
-        อัปเดตความคืบหน้า
-        """
-        if self._is_running:
-            self.progress_updated.emit(current, total, message)
-            self._save_resume_state({
-                "last_message_id": message.split(" ")[-1],  # เก็บ ID ของข้อความล่าสุด
-                "downloaded_files": current,
-                "total_files": total,
-                "timestamp": datetime.now().isoformat()
-            })
-
-class ChannelDownloader:
-    """
-    ดาวน์โหลดไฟล์จากช่องทางปกติ
-    """
-    def __init__(self, token: str, guild_id: str, save_metadata: bool = True):
-        self.token = token
-        self.guild_id = guild_id
-        self.base_url = "https://discord.com/api/v9"
-        self.headers = {
-            "Authorization": self.token,
-            "User-Agent": "Mozilla/5.0",
-        }
-        self.save_metadata = save_metadata
-
-    @staticmethod
-    def sanitize_name(name: str) -> str:
-        """
-        ทำความสะอาดชื่อไฟล์/โฟลเดอร์
-        """
-        invalid_chars = '<>:"/\\|?*'
-        for ch in invalid_chars:
-            name = name.replace(ch, '_')
-        return name.strip(' .')
-
-    async def download_attachments_from_channel(
-        self,
-        session: aiohttp.ClientSession,
-        channel_id: str,
-        channel_name: str,
-        progress_callback=None,
-        start_from: Optional[str] = None
-    ) -> None:
-        """
-        ดาวน์โหลดไฟล์แนบจากช่องทาง
-        """
-        channel_folder = os.path.join('DOWNLOADS', self.sanitize_name(channel_name))
-        os.makedirs(channel_folder, exist_ok=True)
-        
-        url = f"{self.base_url}/channels/{channel_id}/messages?limit=100"
-        if start_from:
-            url += f"&before={start_from}"
-
-        total_files = 0
-        downloaded_files = 0
-
-        while url and self._is_running:
-            async with session.get(url, headers=self.headers) as resp:
-                if resp.status != 200:
-                    raise Exception(f"Failed to fetch messages: {resp.status}")
-                
-                messages = await resp.json()
-                if not messages:
-                    break
-                
-                for msg in messages:
-                    if self.save_metadata:
-                        await self._process_message(msg, channel_folder, session)
-                    
-                    for attachment in msg.get("attachments", []):
-                        total_files += 1
-                        if await self._download_attachment(attachment, channel_folder, session):
-                            downloaded_files += 1
-                            if progress_callback:
-                                progress_callback(downloaded_files, total_files, f"Downloading {channel_name} - {attachment['filename']}")
-
-                last_msg_id = messages[-1]["id"]
-                url = f"{self.base_url}/channels/{channel_id}/messages?limit=100&before={last_msg_id}"
-
-    async def _download_attachment(self, attachment: Dict, folder: str, session: aiohttp.ClientSession) -> bool:
-        """
-        ดาวน์โหลดไฟล์แนบ
-        """
-        file_url = attachment["url"]
-        filename = attachment["filename"]
-        file_path = os.path.join(folder, filename)
-        
-        try:
-            async with session.get(file_url, headers=self.headers) as resp:
-                if resp.status == 200:
-                    async with aiofiles.open(file_path, "wb") as f:
-                        await f.write(await resp.read())
-                    return True
-        except Exception as e:
-            print(f"Failed to download {filename}: {str(e)}")
-            return False
-
-    async def _process_message(self, msg: Dict, folder: str, session: aiohttp.ClientSession) -> None:
-        """
-        ประมวลผลข้อความและบันทึก metadata
-        """
-        message_data = {
-            'id': msg['id'],
-            'content': msg.get('content', ''),
-            'author': msg.get('author', {}),
-            'timestamp': msg.get('timestamp', ''),
-            'attachments': [],
-            'embeds': msg.get('embeds', [])
-        }
-        
-        messages_folder = os.path.join(folder, 'messages')
-        os.makedirs(messages_folder, exist_ok=True)
-        
-        for attachment in msg.get('attachments', []):
-            file_url = attachment["url"]
-            filename = attachment["filename"]
-            file_path = os.path.join(folder, filename)
-            
-            message_data['attachments'].append({
-                'filename': filename,
-                'url': file_url,
-                'size': attachment.get('size'),
-                'local_path': os.path.relpath(file_path, folder)
-            })
-        
-        with open(os.path.join(messages_folder, f"{msg['id']}.json"), 'w', encoding='utf-8') as f:
-            json.dump(message_data, f, ensure_ascii=False, indent=2)
-
-class ForumDownloader(ChannelDownloader):
-    """
-    ดาวน์โหลดไฟล์จาก Forum/Thread
-    """
-    async def fetch_forum_channels(self, session: aiohttp.ClientSession) -> List[Dict]:
-        """
-        ดึงข้อมูล Forum Channels ทั้งหมด
-        """
-        url = f"{self.base_url}/guilds/{self.guild_id}/channels"
-        async with session.get(url, headers=self.headers) as resp:
-            if resp.status != 200:
-                raise Exception(f"Failed to fetch channels: {resp.status}")
-            channels = await resp.json()
-            return [ch for ch in channels if ch.get("type") == 15]  # type 15 = forum
-
-    async def fetch_threads_in_forum(self, session: aiohttp.ClientSession, forum_channel_id: str) -> List[Dict]:
-        """
-        ดึงข้อมูล Threads ใน Forum
-        """
-        threads = []
-        
-        # Active threads
-        active_url = f"{self.base_url}/channels/{forum_channel_id}/threads/active"
-        async with session.get(active_url, headers=self.headers) as resp:
-            if resp.status == 200:
-                data = await resp.json()
-                threads.extend(data.get("threads", []))
-        
-        # Archived threads
-        archived_url = f"{self.base_url}/channels/{forum_channel_id}/threads/archived/public"
-        async with session.get(archived_url, headers=self.headers) as resp:
-            if resp.status == 200:
-                data = await resp.json()
-                threads.extend(data.get("threads", []))
-        
-        return threads
-
-    async def download_forum(self, session: aiohttp.ClientSession, progress_callback=None) -> None:
-        """
-        ดาวน์โหลดไฟล์จาก Forum ทั้งหมด
-        """
-        forum_channels = await self.fetch_forum_channels(session)
-        if not forum_channels:
-            raise Exception("No forum channels found")
-        
-        for forum in forum_channels:
-            threads = await self.fetch_threads_in_forum(session, forum['id'])
-            
-            for thread in threads:
-                await self.download_attachments_from_channel(
-                    session,
-                    thread['id'],
-                    f"Forum/{forum['name']}/{thread['name']}",
-                    progress_callback
-                )
\ No newline at end of file
+import os
+import time
+import json
+import hashlib
+import aiohttp
+import aiofiles
+import asyncio
+import mimetypes
+from fnmatch import fnmatch
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from contextlib import asynccontextmanager
+from pathlib import Path
+from urllib.parse import quote
+from typing import Dict, List, Optional, Tuple
+from .ratelimit import RateLimiter, get_rate_limiter
+from .bandwidth import BandwidthLimiter, get_bandwidth_limiter
+from .concurrency import ConcurrencyLimiter, ConcurrencySlot
+from .checkpoint import CheckpointStore
+from .manifest import ChannelManifest
+from .blobstore import BlobStore
+from .metadata import MetadataSink
+from .models import DownloadFilter
+from .utils import file_sha256, datetime_to_snowflake, to_utc
+
+class DownloadResumer:
+    """
+    ระบบ Resume การดาวน์โหลด
+
+    เก็บสถานะของแต่ละช่องทางใน CheckpointStore (journal แบบ append-only)
+    การบันทึกแต่ละครั้งจึงไม่ต้องอ่านและเขียนสถานะทั้งหมดใหม่
+    """
+    max_age = 86400  # สถานะที่เก่ากว่า 24 ชม. จะไม่ถูกนำมาใช้
+
+    def __init__(self, state_file: str = "download_state.db"):
+        self.state_file = state_file
+        self.store = CheckpointStore(state_file)
+
+    def record(self, channel_id: str, progress: Dict) -> None:
+        """
+        บันทึกสถานะของช่องทางเดียว (เพิ่มต่อท้าย journal)
+        """
+        try:
+            self.store.append(str(channel_id), progress)
+        except Exception as e:
+            print(f"Failed to save download state: {e}")
+
+    def load_channel(self, channel_id: str) -> Optional[Dict]:
+        """
+        โหลดสถานะล่าสุดของช่องทางเดียว
+        """
+        try:
+            return self.store.load(str(channel_id), max_age=self.max_age)
+        except Exception as e:
+            print(f"Failed to load download state: {e}")
+        return None
+
+    def clear_channel(self, channel_id: str) -> None:
+        """
+        ลบสถานะของช่องทางเดียว
+        """
+        try:
+            self.store.clear(str(channel_id))
+        except Exception as e:
+            print(f"Failed to clear download state: {e}")
+
+    def save_state(self, download_state: Dict) -> None:
+        """
+        บันทึกสถานะการดาวน์โหลดปัจจุบัน
+        """
+        for channel_id, progress in download_state.items():
+            self.record(channel_id, progress)
+
+    def load_state(self) -> Optional[Dict]:
+        """
+        โหลดสถานะการดาวน์โหลดที่บันทึกไว้
+        """
+        try:
+            return self.store.load_all(max_age=self.max_age) or None
+        except Exception as e:
+            print(f"Failed to load download state: {e}")
+        return None
+
+    def clear_state(self) -> None:
+        """
+        ลบสถานะการดาวน์โหลดทั้งหมด
+        """
+        try:
+            self.store.clear()
+        except Exception as e:
+            print(f"Failed to clear download state: {e}")
+
+class ChannelDownloader:
+    """
+    ดาวน์โหลดไฟล์จากช่องทางปกติ
+    """
+    chunk_size = 1024 * 1024  # 1 MB ต่อ chunk
+    prefetch_pages = 2        # จำนวนหน้าที่ตัวดึงข้อความดึงล่วงหน้าได้
+    throttled_chunk_size = 64 * 1024  # ขนาด chunk เมื่อจำกัดความเร็ว (ให้ความเร็วสม่ำเสมอขึ้น)
+    initial_concurrency = 2   # จำนวนไฟล์ที่เริ่มดาวน์โหลดพร้อมกันก่อนปรับเพิ่ม/ลดเอง
+    max_concurrent_requests = 4  # จำนวน request ไปยัง Discord API พร้อมกันสูงสุดของ downloader นี้
+    segment_attempts = 3  # จำนวน request ต่อช่วงของการดาวน์โหลดแบบแบ่งช่วง เมื่อได้ข้อมูลไม่ครบช่วง
+
+    def __init__(self, token: str, guild_id: str, save_metadata: bool = True, max_concurrent_downloads: int = 5,
+                 rate_limiter: Optional[RateLimiter] = None, download_segments: int = 4,
+                 segment_threshold: int = 64 * 1024 * 1024, verify_checksums: bool = False,
+                 blob_store: Optional[BlobStore] = None, download_limiter: Optional[asyncio.Semaphore] = None,
+                 bandwidth_limiter: Optional[BandwidthLimiter] = None, filters: Optional[DownloadFilter] = None):
+        self.token = token
+        self.guild_id = guild_id
+        self.base_url = "https://discord.com/api/v9"
+        self.headers = {
+            "Authorization": self.token,
+            "User-Agent": "Mozilla/5.0",
+        }
+        self.save_metadata = save_metadata
+        self.max_concurrent_downloads = max(1, max_concurrent_downloads)
+        # จำนวนไฟล์และ request ที่ทำพร้อมกันปรับเองตาม 429 / 5xx / latency (ไม่เกินค่าสูงสุดข้างต้น)
+        self.download_concurrency = ConcurrencyLimiter(self.initial_concurrency, max_limit=self.max_concurrent_downloads)
+        self.api_concurrency = ConcurrencyLimiter(1, max_limit=self.max_concurrent_requests)
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.download_segments = max(1, download_segments)
+        self.segment_threshold = segment_threshold
+        self.verify_checksums = verify_checksums
+        self.blob_store = blob_store
+        self.download_limiter = download_limiter  # จำกัดจำนวนไฟล์ที่ดาวน์โหลดพร้อมกันร่วมกับช่องทางอื่น
+        # ความเร็วถูกจำกัดทั้งแบบรวมทั้งโปรเซสและเฉพาะงานนี้ (ถ้ากำหนด bandwidth_limiter)
+        self.bandwidth_limiters = [get_bandwidth_limiter()] + ([bandwidth_limiter] if bandwidth_limiter else [])
+        self.filters = filters
+        # ช่วง ID ข้อความตามช่วงวันที่ใน filters (ข้อความที่ ID ไม่อยู่ในช่วงจะไม่ถูกดึงเลย)
+        self.min_message_id, self.max_message_id = self._message_id_bounds(filters)
+        self._manifests: Dict[str, ChannelManifest] = {}
+        self._manifest_users: Dict[str, int] = {}
+        # ชื่อไฟล์ที่จองไว้ให้ไฟล์แนบที่ยังดาวน์โหลดไม่เสร็จ: โฟลเดอร์ -> {ชื่อไฟล์: ID ไฟล์แนบ}
+        self._claimed_names: Dict[str, Dict[str, str]] = {}
+        self._metadata_sinks: Dict[str, MetadataSink] = {}
+        self._is_running = True
+        # สถิติสำหรับติดตามความคืบหน้า (เช่น ProgressStream)
+        self.bytes_downloaded = 0
+        self.failed_files = 0
+        self.last_error: Optional[str] = None
+
+    def stop(self) -> None:
+        """
+        หยุดการดาวน์โหลด (ไฟล์ที่กำลังดาวน์โหลดอยู่จะทำงานจนเสร็จ)
+        """
+        self._is_running = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._is_running
+
+    @staticmethod
+    def _message_id_bounds(filters: Optional[DownloadFilter]) -> Tuple[Optional[int], Optional[int]]:
+        """
+        แปลงช่วงวันที่ของ filters เป็น snowflake (after, before) โดย days นับจากเวลาปัจจุบัน
+
+        เวลาทั้งหมดถูกแปลงเป็น UTC ก่อนเปรียบเทียบ (เวลาที่ไม่มี timezone ถือเป็นเวลาท้องถิ่น)
+        """
+        if filters is None:
+            return None, None
+        after = to_utc(filters.after) if filters.after else None
+        before = to_utc(filters.before) if filters.before else None
+        if filters.days:
+            recent = datetime.now(timezone.utc) - timedelta(days=filters.days)
+            after = max(after, recent) if after else recent
+        return (
+            datetime_to_snowflake(after) if after else None,
+            datetime_to_snowflake(before) if before else None
+        )
+
+    def _message_wanted(self, msg: Dict) -> bool:
+        """
+        ตรวจผู้ส่งของข้อความตาม filters
+        """
+        if self.filters is None or not self.filters.authors:
+            return True
+        author = msg.get("author") or {}
+        return str(author.get("id")) in self.filters.authors or author.get("username") in self.filters.authors
+
+    def _attachment_wanted(self, attachment: Dict) -> bool:
+        """
+        ตรวจขนาดและชนิดของไฟล์แนบตาม filters จากข้อมูลในข้อความ (ไม่ส่ง request ไปยัง CDN)
+        """
+        filters = self.filters
+        if filters is None:
+            return True
+        size = attachment.get("size") or 0
+        if filters.min_size is not None and size < filters.min_size:
+            return False
+        if filters.max_size is not None and size > filters.max_size:
+            return False
+        if filters.extensions or filters.content_types:
+            filename = attachment.get("filename", "")
+            extension = os.path.splitext(filename)[1].lstrip(".").lower()
+            content_type = attachment.get("content_type") or mimetypes.guess_type(filename)[0] or ""
+            content_type = content_type.split(";")[0].strip().lower()
+            return extension in filters.extensions or any(
+                fnmatch(content_type, pattern) for pattern in filters.content_types
+            )
+        return True
+
+    def concurrency_status(self) -> Dict:
+        """
+        สถานะของตัวปรับจำนวนงานพร้อมกัน (สำหรับ monitoring)
+        """
+        return {"downloads": self.download_concurrency.status(), "api": self.api_concurrency.status()}
+
+    @asynccontextmanager
+    async def _api_request(self, session: aiohttp.ClientSession, url: str):
+        """
+        ส่ง GET ไปยัง Discord API ผ่าน rate limiter ภายใต้ api_concurrency
+        """
+        async with self.api_concurrency.slot() as slot:
+            async with self.rate_limiter.request(session, "GET", url, on_response=slot.record, headers=self.headers) as resp:
+                yield resp
+
+    def _read_size(self) -> int:
+        """
+        ขนาด chunk ที่อ่านจาก CDN (เล็กลงเมื่อจำกัดความเร็ว)
+        """
+        if any(limiter.limited for limiter in self.bandwidth_limiters):
+            return min(self.chunk_size, self.throttled_chunk_size)
+        return self.chunk_size
+
+    async def _throttle(self, nbytes: int) -> None:
+        """
+        รอตามตัวจำกัดความเร็วทุกตัวก่อนอ่าน chunk ถัดไป
+        """
+        for limiter in self.bandwidth_limiters:
+            await limiter.consume(nbytes)
+
+    def _get_manifest(self, folder: str) -> ChannelManifest:
+        """
+        คืนค่า manifest ของโฟลเดอร์ช่องทาง (เปิดครั้งเดียวต่อโฟลเดอร์)
+        """
+        manifest = self._manifests.get(folder)
+        if manifest is None:
+            manifest = self._manifests[folder] = ChannelManifest(folder, self.verify_checksums)
+        return manifest
+
+    def _open_channel(self, folder: str) -> ChannelManifest:
+        """
+        เริ่มใช้โฟลเดอร์ของช่องทาง (ต้องเรียก _close_channel เมื่อเสร็จ)
+        """
+        self._manifest_users[folder] = self._manifest_users.get(folder, 0) + 1
+        return self._get_manifest(folder)
+
+    def _close_channel(self, folder: str) -> None:
+        """
+        ปิด manifest และคืนชื่อไฟล์ที่จองไว้ของโฟลเดอร์ เมื่อไม่มีงานใดใช้โฟลเดอร์นี้แล้ว
+        """
+        users = self._manifest_users.pop(folder, 1) - 1
+        if users > 0:
+            self._manifest_users[folder] = users
+            return
+        self._claimed_names.pop(folder, None)
+        manifest = self._manifests.pop(folder, None)
+        if manifest:
+            manifest.close()
+
+    def _local_filename(self, attachment: Dict, folder: str) -> str:
+        """
+        เลือกชื่อไฟล์ในโฟลเดอร์ของช่องทางให้ไฟล์แนบ
+
+        ใช้ชื่อเดิมของไฟล์แนบถ้ายังไม่มีไฟล์แนบอื่นใช้ชื่อนี้ ไม่เช่นนั้นใช้ {id}_{filename}
+        ไฟล์แนบที่อยู่ใน manifest แล้วจะได้ชื่อเดิมที่บันทึกไว้เสมอ
+        """
+        filename = attachment["filename"]
+        if "id" not in attachment:
+            return filename
+        attachment_id = str(attachment["id"])
+        manifest = self._get_manifest(folder)
+        entry = manifest.get(attachment_id)
+        if entry is not None:
+            return entry["path"]
+
+        claims = self._claimed_names.setdefault(folder, {})
+        unique_name = f"{attachment_id}_{filename}"
+        for name in (filename, unique_name):
+            owner = claims.get(name) or manifest.owner(name)
+            if owner == attachment_id:
+                return name
+            if owner is None and not os.path.exists(os.path.join(folder, name)):
+                claims[name] = attachment_id
+                return name
+        claims[unique_name] = attachment_id
+        return unique_name
+
+    def _get_metadata_sink(self, folder: str) -> MetadataSink:
+        """
+        คืนค่าตัวเขียน metadata ของโฟลเดอร์ช่องทาง (เก็บไว้ในโฟลเดอร์ messages)
+        """
+        sink = self._metadata_sinks.get(folder)
+        if sink is None:
+            sink = self._metadata_sinks[folder] = MetadataSink(os.path.join(folder, 'messages'))
+        return sink
+
+    @staticmethod
+    def sanitize_name(name: str) -> str:
+        """
+        ทำความสะอาดชื่อไฟล์/โฟลเดอร์
+        """
+        invalid_chars = '<>:"/\\|?*'
+        for ch in invalid_chars:
+            name = name.replace(ch, '_')
+        return name.strip(' .')
+
+    async def _iter_message_pages(
+        self,
+        session: aiohttp.ClientSession,
+        channel_id: str,
+        before: Optional[int] = None,
+        after: Optional[int] = None,
+        forward: bool = False
+    ):
+        """
+        ดึงข้อความที่ ID อยู่ระหว่าง after และ before (ไม่รวมปลายทั้งสองข้าง) ทีละหน้า (100 ข้อความ)
+
+        ปกติจะเดินย้อนหลังจาก before หรือจากข้อความล่าสุด (before=) และหยุดเมื่อถึง after
+        ถ้า forward=True จะเดินไปข้างหน้าจาก after (after=) และหยุดเมื่อถึง before
+        """
+        if forward:
+            cursor_param, cursor = "after", after
+        else:
+            cursor_param, cursor = "before", before
+
+        while self._is_running:
+            url = f"{self.base_url}/channels/{channel_id}/messages?limit=100"
+            if cursor:
+                url += f"&{cursor_param}={cursor}"
+
+            async with self._api_request(session, url) as resp:
+                if resp.status != 200:
+                    raise Exception(f"Failed to fetch messages: {resp.status}")
+                messages = await resp.json()
+
+            in_range = [
+                msg for msg in messages
+                if (after is None or int(msg["id"]) > after) and (before is None or int(msg["id"]) < before)
+            ]
+            if in_range:
+                yield in_range
+            if len(in_range) < len(messages) or not messages:
+                break  # ถึงขอบของช่วงหรือหมดข้อความแล้ว
+
+            cursor = self._page_cursor(messages, forward)
+
+    @staticmethod
+    async def _run_supervised(tasks: List[asyncio.Task]) -> None:
+        """
+        รองานทั้งหมดให้เสร็จ ถ้างานใดล้มเหลว (หรือถูก cancel จากภายนอก) จะยกเลิกงานที่เหลือทั้งหมด
+        แล้ว raise ข้อผิดพลาดแรก จึงไม่มีงานค้างรอคิวหรือทำงานต่อบน session ที่ปิดแล้ว
+        """
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in tasks:
+                if task.done() and not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def _slice_ranges(channel_id: str, slices: int, after: Optional[int], before: Optional[int]) -> List[List[int]]:
+        """
+        แบ่งช่วง ID ข้อความ (after, before) เป็น slices ช่วงที่ไม่ทับกันและยาวเท่ากันตามเวลา
+
+        ค่าเริ่มต้นคือตั้งแต่สร้างช่องทาง (ID ของช่องทาง) ถึงปัจจุบัน
+        คืนค่า [[after, before], ...] (ไม่รวมปลายทั้งสองข้าง) เรียงจากเก่าไปใหม่
+        """
+        lower = max(after or 0, int(channel_id) - 1)
+        upper = before or datetime_to_snowflake(datetime.now(timezone.utc) + timedelta(seconds=1))
+        step = (upper - lower) // slices
+        if step <= 1:
+            return [[lower, upper]]
+        edges = [lower + step * i for i in range(slices)] + [upper]
+        return [[edges[i] - (1 if i else 0), edges[i + 1]] for i in range(slices)]
+
+    @staticmethod
+    def _page_cursor(messages: List[Dict], forward: bool = False) -> str:
+        """
+        คืนค่า ID ที่ใช้เป็น cursor ของหน้าถัดไป (เก่าสุดเมื่อเดินย้อนหลัง, ใหม่สุดเมื่อเดินไปข้างหน้า)
+        """
+        ids = [int(msg["id"]) for msg in messages]
+        return str(max(ids) if forward else min(ids))
+
+    async def download_attachments_from_channel(
+        self,
+        session: aiohttp.ClientSession,
+        channel_id: str,
+        channel_name: str,
+        progress_callback=None,
+        start_from: Optional[str] = None,
+        checkpoint_callback=None,
+        incremental: bool = False,
+        slices: int = 1
+    ) -> None:
+        """
+        ดาวน์โหลดไฟล์แนบจากช่องทาง
+
+        ทำงานแบบ producer/consumer: ตัวดึงหน้าข้อความจะดึงล่วงหน้าไม่เกิน prefetch_pages หน้า
+        และส่งไฟล์แนบเข้าคิว ให้ worker max_concurrent_downloads ตัวดาวน์โหลด โดยจำนวนที่ดาวน์โหลด
+        พร้อมกันจริงถูกปรับตาม download_concurrency
+        checkpoint_callback จะถูกเรียกด้วย ID ข้อความสุดท้ายของหน้า ตามลำดับหน้า
+        เมื่อไฟล์แนบทุกไฟล์ในหน้านั้น (และหน้าก่อนหน้า) ดาวน์โหลดสำเร็จแล้วเท่านั้น
+        ถ้ามีไฟล์ที่ดาวน์โหลดไม่สำเร็จ checkpoint จะหยุดที่หน้าก่อนหน้านั้น high-water mark
+        จะไม่ถูกเลื่อน และจะ raise Exception เมื่อดึงครบ เพื่อให้ทำซ้ำจากจุดเดิมได้
+
+        incremental=True จะดึงเฉพาะข้อความที่ใหม่กว่า high-water mark ของช่องทาง (after=)
+        และเลื่อน high-water mark ไปตามหน้าที่เสร็จแล้ว ถ้ายังไม่เคย sync ครบจะดึงทั้งหมดตามปกติ
+        ถ้ามี filters จะดึงเฉพาะข้อความในช่วงวันที่ และดาวน์โหลดเฉพาะไฟล์แนบที่ผ่านตัวกรอง
+
+        slices > 1 จะแบ่งช่วง ID ข้อความตั้งแต่สร้างช่องทางถึงปัจจุบันเป็น slices ช่วงตามเวลา
+        แล้วดึงรายการข้อความทุกช่วงพร้อมกัน (ใช้ worker และตัวนับความคืบหน้าชุดเดียวกัน)
+        cursor ของแต่ละช่วงถูกบันทึกใน manifest แทน checkpoint_callback และ start_from
+        จึงดาวน์โหลดต่อได้ทีละช่วงโดยใช้การแบ่งช่วงเดิมจนกว่าจะดึงครบ (ไม่ใช้กับ incremental
+        ที่มี high-water mark แล้ว เพราะดึงไปข้างหน้าจาก high-water mark อยู่แล้ว)
+        """
+        channel_folder = os.path.join('DOWNLOADS', self.sanitize_name(channel_name))
+        os.makedirs(channel_folder, exist_ok=True)
+        manifest = self._open_channel(channel_folder)
+
+        high_water_mark = manifest.get_sync_state("high_water_mark") if incremental else None
+        forward = bool(high_water_mark)
+        sliced = slices > 1 and not forward
+        after, before = self.min_message_id, self.max_message_id
+        if forward:
+            ranges = [[max(int(high_water_mark), after or 0), before]]
+        elif sliced:
+            plan = manifest.get_sync_state("crawl_slices")
+            if plan:
+                ranges = json.loads(plan)
+            else:
+                ranges = self._slice_ranges(channel_id, slices, after, before)
+                manifest.set_sync_state("crawl_slices", json.dumps(ranges))
+            # ให้ทุกช่วงดึงรายการข้อความพร้อมกันได้
+            self.api_concurrency.max_limit = max(self.api_concurrency.max_limit, len(ranges))
+        elif start_from:
+            ranges = [[after, min(int(start_from), before) if before else int(start_from)]]
+        else:
+            ranges = [[after, before]]
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.prefetch_pages * 100 * len(ranges))
+        # หน้าที่ยังค้างของแต่ละช่วง: [cursor, งานที่ยังค้าง, index ของช่วง, มีไฟล์ล้มเหลว]
+        # เรียงตามลำดับหน้า
+        lanes = [deque() for _ in ranges]
+        # ช่วงที่มีไฟล์ล้มเหลวแล้ว (checkpoint ของช่วงนี้จะไม่ถูกเลื่อนอีก)
+        stalled = [False] * len(ranges)
+        counters = {"total": 0, "downloaded": 0, "failed": 0}
+        # ID ข้อความใหม่สุดที่เห็นจริง (รวมจากรอบก่อนที่ดึงค้างไว้) จะกลายเป็น high-water mark
+        # เมื่อดึงครบ
+        pending = manifest.get_sync_state("pending_high_water_mark") if not forward else None
+        newest_seen = [int(pending) if pending else 0]
+
+        def advance_checkpoint(index: int) -> None:
+            pages = lanes[index]
+            while pages and pages[0][1] == 0:
+                cursor, _, _, failed = pages.popleft()
+                stalled[index] = stalled[index] or failed
+                if not self._is_running or stalled[index]:
+                    continue
+                if sliced:
+                    ranges[index][1] = int(cursor)
+                    manifest.set_sync_state("crawl_slices", json.dumps(ranges))
+                elif forward:
+                    manifest.set_sync_state("high_water_mark", cursor)
+                elif checkpoint_callback:
+                    checkpoint_callback(cursor)
+
+        async def produce(index: int) -> None:
+            lane_after, lane_before = ranges[index]
+            async for messages in self._iter_message_pages(session, channel_id, lane_before, lane_after, forward):
+                newest = int(self._page_cursor(messages, forward=True))
+                if not forward and newest > newest_seen[0]:
+                    newest_seen[0] = newest
+                    manifest.set_sync_state("pending_high_water_mark", str(newest))
+
+                # เริ่มที่ 1 เพื่อกันไม่ให้ checkpoint ผ่านหน้านี้ก่อนส่งไฟล์แนบเข้าคิวครบ
+                page = [self._page_cursor(messages, forward), 1, index, False]
+                lanes[index].append(page)
+                for msg in messages:
+                    if not self._message_wanted(msg):
+                        continue
+                    if self.save_metadata:
+                        await self._process_message(msg, channel_folder, session)
+
+                    for attachment in msg.get("attachments", []):
+                        if not self._attachment_wanted(attachment):
+                            continue
+                        page[1] += 1
+                        counters["total"] += 1
+                        await queue.put((attachment, page))
+                page[1] -= 1
+                advance_checkpoint(index)
+
+        async def consume() -> None:
+            while True:
+                job = await queue.get()
+                if job is None:
+                    return
+                attachment, page = job
+                try:
+                    if not self._is_running:
+                        continue
+                    if await self._limited_download(attachment, channel_folder, session):
+                        counters["downloaded"] += 1
+                        if progress_callback:
+                            progress_callback(counters["downloaded"], counters["total"], f"Downloading {channel_name} - {attachment['filename']}")
+                    elif self._is_running:
+                        counters["failed"] += 1
+                        page[3] = True
+                finally:
+                    page[1] -= 1
+                    advance_checkpoint(page[2])
+
+        async def produce_all() -> None:
+            await asyncio.gather(*(produce(index) for index in range(len(ranges))))
+            for _ in range(self.max_concurrent_downloads):
+                await queue.put(None)
+
+        tasks = [asyncio.create_task(consume()) for _ in range(self.max_concurrent_downloads)]
+        tasks.append(asyncio.create_task(produce_all()))
+        try:
+            await self._run_supervised(tasks)
+
+            if counters["failed"]:
+                raise Exception(f"Failed to download {counters['failed']} file(s) from {channel_name}: {self.last_error}")
+            if sliced and self._is_running:
+                manifest.set_sync_state("crawl_slices", None)
+            if not forward and self._is_running and newest_seen[0]:
+                manifest.set_sync_state("high_water_mark", str(newest_seen[0]))
+                manifest.set_sync_state("pending_high_water_mark", None)
+        finally:
+            sink = self._metadata_sinks.pop(channel_folder, None)
+            if sink:
+                await asyncio.to_thread(sink.close)
+            self._close_channel(channel_folder)
+
+    @staticmethod
+    def _load_partial_meta(meta_path: str) -> Dict:
+        """
+        โหลดข้อมูลของไฟล์ .part ที่ดาวน์โหลดค้างไว้ (url, etag, size)
+        """
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_partial_meta(meta_path: str, meta: Dict) -> None:
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    @staticmethod
+    def _range_matches(resp: aiohttp.ClientResponse, offset: int, meta: Dict) -> bool:
+        """
+        ตรวจสอบว่า response 206 ต่อจากไฟล์ .part ได้จริง (Content-Range และ ETag ตรงกัน)
+        """
+        content_range = resp.headers.get("Content-Range", "")
+        try:
+            unit, spec = content_range.split(" ", 1)
+            byte_range, total = spec.split("/", 1)
+            start = int(byte_range.split("-", 1)[0])
+        except ValueError:
+            return False
+        if unit != "bytes" or start != offset:
+            return False
+        if meta.get("size") and total != "*" and int(total) != meta["size"]:
+            return False
+        etag = resp.headers.get("ETag")
+        return not (etag and meta.get("etag") and etag != meta["etag"])
+
+    async def _download_segmented(
+        self,
+        attachment: Dict,
+        file_path: str,
+        part_path: str,
+        meta_path: str,
+        session: aiohttp.ClientSession,
+        slot: ConcurrencySlot
+    ) -> Optional[bool]:
+        """
+        ดาวน์โหลดไฟล์ขนาดใหญ่โดยแบ่งเป็นช่วง byte และดึงพร้อมกันหลาย connection
+
+        ไฟล์ .part จะถูกจองขนาดเต็มไว้ก่อน แล้วแต่ละช่วงเขียนลงตำแหน่งของตัวเอง
+        ช่วงที่เสร็จแล้วจะถูกบันทึกในไฟล์ .part.json เพื่อดาวน์โหลดต่อเฉพาะช่วงที่ขาด
+        ช่วงจะถูกบันทึกว่าเสร็จเมื่อได้ข้อมูลครบทุก byte ของช่วงแล้วเท่านั้น
+        คืนค่า None ถ้าเซิร์ฟเวอร์ไม่รองรับ Range (ให้ผู้เรียกดาวน์โหลดแบบปกติแทน)
+        ถ้าล้มเหลวด้วยสาเหตุอื่น (เช่น 429 / 5xx / เครือข่าย) จะคืนค่า False และเก็บไฟล์ .part ไว้
+        """
+        file_url = attachment["url"]
+        size = attachment["size"]
+        segment_size = -(-size // self.download_segments)
+        ranges = [(start, min(start + segment_size, size) - 1) for start in range(0, size, segment_size)]
+
+        meta = self._load_partial_meta(meta_path) if os.path.exists(part_path) else {}
+        if meta.get("mode") != "segmented" or meta.get("size") != size or meta.get("segments") != len(ranges):
+            meta = {"url": file_url, "etag": None, "size": size, "mode": "segmented", "segments": len(ranges), "done": []}
+            with open(part_path, "wb") as f:
+                f.truncate(size)
+            self._save_partial_meta(meta_path, meta)
+        done = set(meta["done"])
+
+        class RangeNotSupported(Exception):
+            pass
+
+        async def fetch_segment(index: int, start: int, end: int) -> None:
+            position = start
+            for _ in range(self.segment_attempts):
+                headers = dict(self.headers)
+                headers["Range"] = f"bytes={position}-{end}"
+                if meta.get("etag"):
+                    headers["If-Range"] = meta["etag"]
+
+                started = time.monotonic()
+                async with session.get(file_url, headers=headers) as resp:
+                    slot.record(resp, time.monotonic() - started)
+                    if resp.status == 200 or (resp.status == 206 and not self._range_matches(resp, position, meta)):
+                        # เซิร์ฟเวอร์ไม่สนใจ Range หรือไฟล์ต้นทางเปลี่ยนไป: ช่วงที่มีอยู่ใช้ไม่ได้แล้ว
+                        raise RangeNotSupported()
+                    if resp.status != 206:
+                        # 429 / 5xx / อื่นๆ: เก็บช่วงที่เสร็จแล้วไว้ให้ดาวน์โหลดต่อในครั้งถัดไป
+                        raise Exception(f"HTTP {resp.status}")
+                    if not meta.get("etag"):
+                        meta["etag"] = resp.headers.get("ETag")
+                    try:
+                        async with aiofiles.open(part_path, "r+b") as f:
+                            await f.seek(position)
+                            async for chunk in resp.content.iter_chunked(self._read_size()):
+                                chunk = chunk[:end + 1 - position]
+                                if not chunk:
+                                    break
+                                await f.write(chunk)
+                                position += len(chunk)
+                                self.bytes_downloaded += len(chunk)
+                                self.download_concurrency.transferred(len(chunk))
+                                await self._throttle(len(chunk))
+                    except aiohttp.ClientPayloadError:
+                        pass  # body ขาดกลางทาง: ขอส่วนที่เหลือของช่วงนี้ใหม่
+
+                if position > end:
+                    done.add(index)
+                    meta["done"] = sorted(done)
+                    self._save_partial_meta(meta_path, meta)
+                    return
+                # ได้ข้อมูลไม่ครบช่วง (เช่น Content-Range สั้นกว่าที่ขอ): ขอต่อจากตำแหน่งล่าสุด
+            raise Exception(f"Incomplete segment {start}-{end}: got {position - start} of {end - start + 1} bytes")
+
+        tasks = [
+            asyncio.create_task(fetch_segment(index, start, end))
+            for index, (start, end) in enumerate(ranges)
+            if index not in done
+        ]
+        try:
+            # ให้ทุกช่วงทำจนจบแม้บางช่วงล้มเหลว ช่วงที่เสร็จจะถูกบันทึกไว้ดาวน์โหลดต่อ
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        errors = [result for result in results if isinstance(result, Exception)]
+        error = next((e for e in errors if isinstance(e, RangeNotSupported)), errors[0] if errors else None)
+
+        if isinstance(error, RangeNotSupported):
+            Path(part_path).unlink(missing_ok=True)
+            Path(meta_path).unlink(missing_ok=True)
+            return None
+        if error:
+            print(f"Failed to download {attachment['filename']}: {str(error)}")
+            slot.failed(error)
+            self.failed_files += 1
+            self.last_error = f"Failed to download {attachment['filename']}: {str(error)}"
+            return False
+        return len(done) == len(ranges)
+
+    async def _finalize_download(
+        self,
+        attachment: Dict,
+        folder: str,
+        file_path: str,
+        part_path: str,
+        meta_path: str,
+        sha256: Optional[str] = None
+    ) -> None:
+        """
+        ย้ายไฟล์ .part ไปเป็นไฟล์จริงและบันทึกลง manifest
+        """
+        if sha256 is None:
+            sha256 = await asyncio.to_thread(file_sha256, part_path)
+        size = os.path.getsize(part_path)
+        if self.blob_store:
+            await asyncio.to_thread(self.blob_store.ingest, part_path, sha256, attachment.get("id"))
+            await asyncio.to_thread(self.blob_store.link, sha256, file_path)
+        else:
+            os.replace(part_path, file_path)
+        Path(meta_path).unlink(missing_ok=True)
+        if "id" in attachment:
+            self._get_manifest(folder).add(
+                attachment["id"], attachment["filename"], os.path.relpath(file_path, folder), size, sha256
+            )
+
+    async def _limited_download(self, attachment: Dict, folder: str, session: aiohttp.ClientSession) -> bool:
+        """
+        ดาวน์โหลดไฟล์แนบภายใต้ download_concurrency และ download_limiter ที่ใช้ร่วมกัน (ถ้ามี)
+        """
+        async with self.download_concurrency.slot() as slot:
+            if self.download_limiter is None:
+                return await self._download_attachment(attachment, folder, session, slot)
+            async with self.download_limiter:
+                if not self._is_running:
+                    return False
+                return await self._download_attachment(attachment, folder, session, slot)
+
+    async def _download_attachment(self, attachment: Dict, folder: str, session: aiohttp.ClientSession,
+                                   slot: ConcurrencySlot) -> bool:
+        """
+        ดาวน์โหลดไฟล์แนบ
+
+        เขียนข้อมูลลงไฟล์ .part ทีละ chunk แล้วเปลี่ยนชื่อเป็นไฟล์จริงเมื่อดาวน์โหลดครบ
+        หน่วยความจำที่ใช้ต่อไฟล์จึงไม่เกิน chunk_size
+        ถ้ามีไฟล์ .part ค้างจากครั้งก่อน จะขอเฉพาะส่วนที่เหลือด้วย Range request
+        และเริ่มใหม่ทั้งไฟล์ถ้าเซิร์ฟเวอร์ไม่รองรับ Range หรือไฟล์ต้นทางเปลี่ยนไป
+        ไฟล์ที่อยู่ใน manifest และตรวจสอบผ่านแล้วจะถูกข้ามโดยไม่ส่ง request
+        ถ้าใช้ blob_store ไฟล์จะถูกเก็บแบบ content-addressed และ link มายังโฟลเดอร์ของช่องทาง
+        """
+        manifest = self._get_manifest(folder)
+        if await manifest.is_downloaded(attachment):
+            return True
+
+        file_url = attachment["url"]
+        filename = self._local_filename(attachment, folder)
+        file_path = os.path.join(folder, filename)
+
+        sha256 = self.blob_store.lookup(attachment["id"]) if self.blob_store and "id" in attachment else None
+        if sha256:
+            # ไฟล์แนบนี้เคยดาวน์โหลดแล้วจากช่องทางอื่น: link จาก blob store โดยไม่ต้องดาวน์โหลดใหม่
+            await asyncio.to_thread(self.blob_store.link, sha256, file_path)
+            manifest.add(attachment["id"], attachment["filename"], filename, os.path.getsize(file_path), sha256)
+            return True
+
+        part_path = f"{file_path}.{attachment.get('id', 'tmp')}.part"
+        meta_path = f"{part_path}.json"
+
+        size = attachment.get("size") or 0
+        if self.download_segments > 1 and size >= self.segment_threshold:
+            result = await self._download_segmented(attachment, file_path, part_path, meta_path, session, slot)
+            if result:
+                await self._finalize_download(attachment, folder, file_path, part_path, meta_path)
+            if result is not None:
+                return result
+            # เซิร์ฟเวอร์ไม่รองรับ Range: ดาวน์โหลดแบบ connection เดียวแทน
+
+        offset = 0
+        if os.path.exists(part_path) and os.path.exists(meta_path):
+            if self._load_partial_meta(meta_path).get("mode") != "segmented":
+                offset = os.path.getsize(part_path)
+
+        sha256 = None
+        try:
+            while True:
+                meta = self._load_partial_meta(meta_path) if offset else {}
+                headers = dict(self.headers)
+                if offset:
+                    headers["Range"] = f"bytes={offset}-"
+                    if meta.get("etag"):
+                        headers["If-Range"] = meta["etag"]
+
+                started = time.monotonic()
+                async with session.get(file_url, headers=headers) as resp:
+                    slot.record(resp, time.monotonic() - started)
+                    if offset and resp.status == 416 and meta.get("size") == offset:
+                        break  # ไฟล์ .part ครบแล้ว
+                    if offset and not (resp.status == 206 and self._range_matches(resp, offset, meta)):
+                        offset = 0
+                        if resp.status != 200:
+                            continue  # ต่อไฟล์เดิมไม่ได้ ดาวน์โหลดใหม่ทั้งไฟล์
+                    if resp.status != (206 if offset else 200):
+                        self.failed_files += 1
+                        self.last_error = f"Failed to download {filename}: HTTP {resp.status}"
+                        return False
+
+                    digest = hashlib.sha256()
+                    if offset:
+                        await asyncio.to_thread(file_sha256, part_path, digest)
+                    else:
+                        self._save_partial_meta(meta_path, {
+                            "url": file_url,
+                            "etag": resp.headers.get("ETag"),
+                            "size": resp.content_length or attachment.get("size")
+                        })
+                    async with aiofiles.open(part_path, "ab" if offset else "wb") as f:
+                        async for chunk in resp.content.iter_chunked(self._read_size()):
+                            digest.update(chunk)
+                            await f.write(chunk)
+                            self.bytes_downloaded += len(chunk)
+                            self.download_concurrency.transferred(len(chunk))
+                            await self._throttle(len(chunk))
+                    sha256 = digest.hexdigest()
+                break
+
+            await self._finalize_download(attachment, folder, file_path, part_path, meta_path, sha256)
+            return True
+        except Exception as e:
+            # เก็บไฟล์ .part ไว้เพื่อดาวน์โหลดต่อในครั้งถัดไป
+            print(f"Failed to download {filename}: {str(e)}")
+            slot.failed(e)
+            self.failed_files += 1
+            self.last_error = f"Failed to download {filename}: {str(e)}"
+        return False
+
+    async def _process_message(self, msg: Dict, folder: str, session: aiohttp.ClientSession) -> None:
+        """
+        ประมวลผลข้อความและบันทึก metadata
+
+        metadata จะถูกส่งเข้า MetadataSink ของช่องทาง ซึ่งเขียนลงดิสก์แบบ batch ใน thread แยก
+        """
+        message_data = {
+            'id': msg['id'],
+            'content': msg.get('content', ''),
+            'author': msg.get('author', {}),
+            'timestamp': msg.get('timestamp', ''),
+            'attachments': [],
+            'embeds': msg.get('embeds', [])
+        }
+        
+        for attachment in msg.get('attachments', []):
+            file_url = attachment["url"]
+            filename = attachment["filename"]
+            
+            message_data['attachments'].append({
+                'id': attachment.get('id'),
+                'filename': filename,
+                'url': file_url,
+                'size': attachment.get('size'),
+                'local_path': self._local_filename(attachment, folder)
+            })
+        
+        self._get_metadata_sink(folder).write(message_data)
+
+class ForumDownloader(ChannelDownloader):
+    """
+    ดาวน์โหลดไฟล์จาก Forum/Thread
+    """
+    max_concurrent_threads = 3  # จำนวน Thread ที่ดาวน์โหลดพร้อมกัน
+
+    async def fetch_forum_channels(self, session: aiohttp.ClientSession) -> List[Dict]:
+        """
+        ดึงข้อมูล Forum Channels ทั้งหมด
+        """
+        url = f"{self.base_url}/guilds/{self.guild_id}/channels"
+        async with self._api_request(session, url) as resp:
+            if resp.status != 200:
+                raise Exception(f"Failed to fetch channels: {resp.status}")
+            channels = await resp.json()
+            return [ch for ch in channels if ch.get("type") == 15]  # type 15 = forum
+
+    async def iter_threads_in_forum(self, session: aiohttp.ClientSession, forum_channel_id: str):
+        """
+        ไล่ดึง Threads ใน Forum ทีละหน้า: active, archived public และ archived private (ถ้า token มีสิทธิ์)
+
+        หน้า archived จะดึงต่อด้วย before=archive_timestamp จนกว่า has_more เป็น false
+        """
+        seen = set()
+
+        # Active threads
+        active_url = f"{self.base_url}/channels/{forum_channel_id}/threads/active"
+        async with self._api_request(session, active_url) as resp:
+            data = await resp.json() if resp.status == 200 else {}
+        for thread in data.get("threads", []):
+            seen.add(thread["id"])
+            yield thread
+
+        # Archived threads (private ต้องใช้สิทธิ์ MANAGE_THREADS ถ้าไม่มีจะได้ 403 และข้ามไป)
+        for visibility in ("public", "private"):
+            before = None
+            while self._is_running:
+                archived_url = f"{self.base_url}/channels/{forum_channel_id}/threads/archived/{visibility}?limit=100"
+                if before:
+                    archived_url += f"&before={quote(before)}"
+                async with self._api_request(session, archived_url) as resp:
+                    if resp.status != 200:
+                        break
+                    data = await resp.json()
+
+                threads = data.get("threads", [])
+                for thread in threads:
+                    if thread["id"] not in seen:
+                        seen.add(thread["id"])
+                        yield thread
+
+                if not data.get("has_more") or not threads:
+                    break
+                before = threads[-1].get("thread_metadata", {}).get("archive_timestamp")
+                if not before:
+                    break
+
+    async def fetch_threads_in_forum(self, session: aiohttp.ClientSession, forum_channel_id: str) -> List[Dict]:
+        """
+        ดึงข้อมูล Threads ทั้งหมดใน Forum
+        """
+        return [thread async for thread in self.iter_threads_in_forum(session, forum_channel_id)]
+
+    def _thread_in_range(self, thread: Dict) -> bool:
+        """
+        ตรวจว่า Thread อาจมีข้อความในช่วงวันที่ของ filters (ข้าม Thread ที่สร้างหลังช่วง
+        หรือมีข้อความล่าสุดก่อนช่วง โดยไม่ต้องดึงข้อความ)
+        """
+        if self.max_message_id is not None and int(thread["id"]) >= self.max_message_id:
+            return False
+        last_message_id = thread.get("last_message_id")
+        if self.min_message_id is not None and last_message_id and int(last_message_id) <= self.min_message_id:
+            return False
+        return True
+
+    async def _download_threads(self, session: aiohttp.ClientSession, forums: List[Dict], progress_callback=None,
+                                incremental: bool = False) -> None:
+        """
+        ไล่ดึงรายการ Thread ไปพร้อมกับดาวน์โหลด โดยดาวน์โหลดพร้อมกันไม่เกิน max_concurrent_threads Thread
+
+        ไฟล์แนบของทุก Thread ใช้ download_limiter ร่วมกัน จึงไม่เกิน max_concurrent_downloads ไฟล์
+        progress_callback ได้รับจำนวนไฟล์รวมของทุก Thread (ไม่ใช่ของ Thread เดียว)
+        Thread ที่ล้มเหลวจะไม่หยุด Thread อื่น แต่เมื่อทำครบทุก Thread แล้วจะ raise Exception
+        ที่รวมข้อผิดพลาดทั้งหมด เพื่อให้งานถูกทำซ้ำ
+        การดาวน์โหลดต่อทำแยกตาม Thread: ไฟล์ที่อยู่ใน manifest ของ Thread แล้วจะถูกข้าม
+        และ incremental=True ใช้ high-water mark ของแต่ละ Thread
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrent_threads * 2)
+        owns_limiter = self.download_limiter is None
+        if owns_limiter:
+            self.download_limiter = asyncio.Semaphore(self.max_concurrent_downloads)
+        # ความคืบหน้าล่าสุดของแต่ละ Thread: ID -> (downloaded, total)
+        thread_progress: Dict[str, Tuple[int, int]] = {}
+        counters = {"downloaded": 0, "total": 0}
+        errors: List[str] = []
+
+        def report_progress(thread_id: str):
+            def update(current: int, total: int, message: str) -> None:
+                last_current, last_total = thread_progress.get(thread_id, (0, 0))
+                thread_progress[thread_id] = (current, total)
+                counters["downloaded"] += current - last_current
+                counters["total"] += total - last_total
+                if progress_callback:
+                    progress_callback(counters["downloaded"], counters["total"], message)
+            return update
+
+        async def produce() -> None:
+            for forum in forums:
+                async for thread in self.iter_threads_in_forum(session, forum['id']):
+                    if not self._is_running:
+                        return
+                    if self._thread_in_range(thread):
+                        await queue.put((forum, thread))
+
+        async def consume() -> None:
+            while True:
+                job = await queue.get()
+                if job is None:
+                    return
+                forum, thread = job
+                if not self._is_running:
+                    continue
+                try:
+                    await self.download_attachments_from_channel(
+                        session,
+                        thread['id'],
+                        f"Forum/{forum['name']}/{thread['name']}",
+                        report_progress(thread['id']),
+                        incremental=incremental
+                    )
+                except Exception as e:
+                    self.last_error = f"Failed to download thread {thread['name']}: {str(e)}"
+                    errors.append(self.last_error)
+
+        async def produce_all() -> None:
+            await produce()
+            for _ in range(self.max_concurrent_threads):
+                await queue.put(None)
+
+        tasks = [asyncio.create_task(consume()) for _ in range(self.max_concurrent_threads)]
+        tasks.append(asyncio.create_task(produce_all()))
+        try:
+            await self._run_supervised(tasks)
+        finally:
+            if owns_limiter:
+                self.download_limiter = None
+        if errors:
+            raise Exception(f"{len(errors)} thread(s) failed: " + "; ".join(errors))
+
+    async def download_forum_channel(self, session: aiohttp.ClientSession, forum: Dict, progress_callback=None,
+                                     incremental: bool = False) -> None:
+        """
+        ดาวน์โหลดไฟล์จากทุก Thread ใน Forum เดียว
+        """
+        await self._download_threads(session, [forum], progress_callback, incremental)
+
+    async def download_forum(self, session: aiohttp.ClientSession, progress_callback=None,
+                             incremental: bool = False) -> None:
+        """
+        ดาวน์โหลดไฟล์จาก Forum ทั้งหมด
+        """
+        forum_channels = await self.fetch_forum_channels(session)
+        if not forum_channels:
+            raise Exception("No forum channels found")
+        
+        await self._download_threads(session, forum_channels, progress_callback, incremental)
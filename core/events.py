@@ -0,0 +1,114 @@
+import time
+import asyncio
+from typing import Dict, List, Optional, Set
+
+class ProgressStream:
+    """
+    กระจายเหตุการณ์ความคืบหน้าของงานดาวน์โหลดไปยังผู้ติดตาม (เช่น SSE / WebSocket)
+
+    เหตุการณ์ที่เกิดบ่อย (ไฟล์เสร็จ, จำนวน byte) จะถูกรวมเป็นเหตุการณ์ "progress"
+    ล่าสุดของแต่ละงาน แล้วส่งออกพร้อมกันทุก interval วินาที ส่วน "started",
+    "error" และ "completed" ส่งตามลำดับที่เกิดขึ้นเสมอ
+    ถ้าไม่มีผู้ติดตามจะไม่เก็บเหตุการณ์ใดๆ เลย ต้องเรียกจาก thread ของ event loop เท่านั้น
+    """
+    def __init__(self, interval: float = 0.5, max_backlog: int = 100):
+        self.interval = interval
+        self.max_backlog = max_backlog
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._events: List[Dict] = []
+        self._progress: Dict[str, Dict] = {}
+        self._sources: Dict[str, object] = {}
+        self._sampled: Dict[str, tuple] = {}
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        สมัครรับเหตุการณ์ คืนค่าคิวที่จะได้รับรายการเหตุการณ์ (list) ทุก interval
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_backlog)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def track(self, channel_id: str, downloader) -> None:
+        """
+        ติดตามจำนวน byte, ไฟล์ที่ล้มเหลว และจำนวนไฟล์ที่ดาวน์โหลดพร้อมกันของ downloader
+        (อ่านค่าเฉพาะตอนส่งเหตุการณ์)
+        """
+        self._sources[channel_id] = downloader
+
+    def publish(self, channel_id: str, event: str, **data) -> None:
+        """
+        เพิ่มเหตุการณ์ของงาน ("started", "progress", "error", "completed", "stopped")
+        """
+        if event == "progress":
+            if self._subscribers:
+                self._progress.setdefault(channel_id, {}).update(data)
+            return
+        if event != "started":
+            # เก็บจำนวน byte ล่าสุดก่อนหยุดติดตามงาน
+            if self._subscribers:
+                self._sample(channel_id)
+            self._sources.pop(channel_id, None)
+            self._sampled.pop(channel_id, None)
+        if self._subscribers:
+            self._events.append({"type": event, "channel_id": channel_id, **data})
+
+    def _sample(self, channel_id: str) -> None:
+        downloader = self._sources.get(channel_id)
+        if downloader is None:
+            return
+        sample = (downloader.bytes_downloaded, downloader.failed_files, int(downloader.download_concurrency.limit))
+        if sample != self._sampled.get(channel_id):
+            self._sampled[channel_id] = sample
+            self._progress.setdefault(channel_id, {}).update(
+                bytes=sample[0], failed_files=sample[1], concurrency=sample[2], last_error=downloader.last_error
+            )
+
+    def _progress_event(self, channel_id: str) -> Optional[Dict]:
+        data = self._progress.pop(channel_id, None)
+        if data is None:
+            return None
+        return {"type": "progress", "channel_id": channel_id, **data}
+
+    def flush(self) -> None:
+        """
+        ส่งเหตุการณ์ที่สะสมไว้ให้ผู้ติดตามทั้งหมด
+        """
+        if not self._subscribers:
+            self._events.clear()
+            self._progress.clear()
+            return
+        for channel_id in list(self._sources):
+            self._sample(channel_id)
+
+        batch = []
+        for event in self._events:
+            if event["type"] != "started":
+                progress = self._progress_event(event["channel_id"])
+                if progress:
+                    batch.append(progress)
+            batch.append(event)
+        for channel_id in list(self._progress):
+            batch.append(self._progress_event(channel_id))
+        self._events = []
+        if not batch:
+            return
+
+        now = time.time()
+        for event in batch:
+            event["time"] = now
+        for queue in list(self._subscribers):
+            if queue.full():
+                # ผู้ติดตามที่อ่านไม่ทันจะเสีย batch ที่เก่าที่สุด
+                queue.get_nowait()
+            queue.put_nowait(batch)
+
+    async def run(self) -> None:
+        """
+        ส่งเหตุการณ์ทุก interval วินาทีจนกว่าจะถูก cancel
+        """
+        while True:
+            await asyncio.sleep(self.interval)
+            self.flush()
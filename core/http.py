@@ -0,0 +1,101 @@
+import asyncio
+import weakref
+from typing import Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+API_HOSTS = ("discord.com", "discordapp.com")
+CDN_HOSTS = ("cdn.discordapp.com", "media.discordapp.net")
+
+class DiscordSession:
+    """
+    ClientSession ที่แยก connection pool ของ API และ CDN ออกจากกัน
+
+    request ไปยัง CDN_HOSTS จะใช้ pool ของ CDN ส่วน host อื่นใช้ pool ของ API
+    การดาวน์โหลดไฟล์จำนวนมากจึงไม่แย่ง socket จนการดึงรายการข้อความจาก API ต้องรอ
+    ทั้งสอง pool เปิด keep-alive และ cache DNS ไว้
+    ใช้แทน aiohttp.ClientSession ได้สำหรับ get / post / request
+
+    pool ของ CDN ไม่จำกัดเวลารวมของ request (ไฟล์ใหญ่, ดาวน์โหลดต่อ หรือถูกจำกัดความเร็วอาจใช้เวลานาน)
+    แต่จำกัดเวลาเชื่อมต่อและเวลาที่ไม่มีข้อมูลเข้ามา ส่วน pool ของ API จำกัดเวลารวมด้วย
+    """
+    api_timeout = aiohttp.ClientTimeout(total=120, sock_connect=30, sock_read=60)
+    cdn_timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+
+    def __init__(
+        self,
+        api_limit: int = 10,
+        cdn_limit: int = 64,
+        dns_ttl: int = 300,
+        keepalive_timeout: float = 60.0
+    ):
+        self.api = aiohttp.ClientSession(
+            connector=self._connector(api_limit, dns_ttl, keepalive_timeout), timeout=self.api_timeout
+        )
+        self.cdn = aiohttp.ClientSession(
+            connector=self._connector(cdn_limit, dns_ttl, keepalive_timeout), timeout=self.cdn_timeout
+        )
+
+    @staticmethod
+    def _connector(limit: int, dns_ttl: int, keepalive_timeout: float) -> aiohttp.TCPConnector:
+        return aiohttp.TCPConnector(
+            limit=limit,
+            limit_per_host=limit,
+            ttl_dns_cache=dns_ttl,
+            use_dns_cache=True,
+            keepalive_timeout=keepalive_timeout
+        )
+
+    def session_for(self, url: str) -> aiohttp.ClientSession:
+        """
+        เลือก session ตาม host ของ URL
+        """
+        host = urlparse(url).hostname or ""
+        return self.cdn if host in CDN_HOSTS else self.api
+
+    def request(self, method: str, url: str, **kwargs):
+        return self.session_for(url).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    @property
+    def closed(self) -> bool:
+        return self.api.closed and self.cdn.closed
+
+    async def close(self) -> None:
+        await self.api.close()
+        await self.cdn.close()
+
+    async def __aenter__(self) -> "DiscordSession":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, DiscordSession]" = weakref.WeakKeyDictionary()
+
+def get_session() -> DiscordSession:
+    """
+    คืนค่า DiscordSession ที่ใช้ร่วมกันของ event loop ปัจจุบัน (สร้างใหม่ถ้ายังไม่มี)
+
+    aiohttp ผูก session ไว้กับ event loop ทุก component ที่ทำงานบน loop เดียวกัน
+    จึงใช้ connection pool ชุดเดียวกัน เจ้าของ loop ควรเรียก close_session() ก่อนปิด loop
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        session = _sessions[loop] = DiscordSession()
+    return session
+
+async def close_session() -> None:
+    """
+    ปิด DiscordSession ของ event loop ปัจจุบัน
+    """
+    session: Optional[DiscordSession] = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
@@ -0,0 +1,306 @@
+import os
+import json
+import math
+import time
+import uuid
+import socket
+from dataclasses import asdict
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from .models import DownloadTask, DownloadFilter
+from .storage import SQLiteStore
+
+# สถานะที่ยังต้องทำงานต่อ (ใช้ตรวจงานซ้ำของช่องทางเดียวกัน)
+LIVE_STATUSES = ("pending", "downloading")
+LIVE_PLACEHOLDERS = ", ".join("?" for _ in LIVE_STATUSES)
+
+class JobQueue(SQLiteStore):
+    """
+    คิวงานดาวน์โหลดแบบถาวรบน SQLite (WAL) ที่สร้างจาก DownloadTask
+
+    - priority: งานที่ค่ามากกว่าทำก่อน (เท่ากันจะเรียงตามเวลาเริ่มและลำดับที่เพิ่ม)
+    - scheduled_time: งานจะไม่ถูกดึงไปทำก่อนเวลานี้
+    - repeat_interval: งานที่ทำซ้ำทุกกี่วินาที (None = ทำครั้งเดียว)
+    การเปลี่ยนสถานะ pending -> downloading -> completed / failed / cancelled แต่ละครั้ง
+    เป็น transaction เดียว งานที่ถูกดึงไปทำจะมีเจ้าของ (owner) และ lease ที่ต้องต่ออายุด้วย
+    heartbeat() ก่อนหมดเวลา lease_duration งานที่ค้างเป็น downloading และ lease หมดอายุแล้ว
+    (เช่น โปรเซสที่ล่ม) จะถูกคืนเป็น pending ด้วย recover() แล้วดาวน์โหลดต่อจากจุด resume เดิม
+    หลายโปรเซสจึงใช้ jobs.db เดียวกันได้โดยไม่แย่งงานที่อีกโปรเซสกำลังทำอยู่
+    """
+    max_attempts = 3      # จำนวนครั้งที่ลองใหม่เมื่อล้มเหลว (งานที่ไม่ทำซ้ำ)
+    retry_delay = 60.0    # วินาที (เพิ่มเป็นสองเท่าในแต่ละครั้ง)
+    lease_duration = 90.0  # วินาที งานที่ไม่ถูก heartbeat นานกว่านี้ถือว่าเจ้าของหยุดทำงานแล้ว
+
+    _COLUMNS = "id, task, priority, run_at, repeat_interval, status"
+
+    def __init__(self, path: str = "jobs.db", owner: Optional[str] = None):
+        super().__init__(path)
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "channel_id TEXT NOT NULL, "
+            "task TEXT NOT NULL, "
+            "priority INTEGER NOT NULL DEFAULT 0, "
+            "run_at REAL NOT NULL, "
+            "repeat_interval REAL, "
+            "status TEXT NOT NULL DEFAULT 'pending', "
+            "attempts INTEGER NOT NULL DEFAULT 0, "
+            "error TEXT, "
+            "created_at REAL NOT NULL, "
+            "updated_at REAL NOT NULL, "
+            "owner TEXT, "
+            "lease_expires_at REAL)"
+        )
+        columns = {row[1] for row in self._connect().execute("PRAGMA table_info(jobs)")}
+        for column, column_type in (("owner", "TEXT"), ("lease_expires_at", "REAL")):
+            if column not in columns:
+                # jobs.db จากเวอร์ชันก่อน
+                self._connect().execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+        self._connect().execute("CREATE INDEX IF NOT EXISTS jobs_due ON jobs (status, priority DESC, run_at, id)")
+        self._connect().execute("CREATE INDEX IF NOT EXISTS jobs_channel ON jobs (channel_id, status)")
+
+    @staticmethod
+    def _task_json(task: DownloadTask) -> str:
+        data = asdict(task)
+        for key in ("scheduled_time", "job_id", "status", "progress", "downloaded_files", "total_files"):
+            data.pop(key, None)
+        data["filters"] = task.filters.to_dict() if task.filters else None
+        return json.dumps(data, ensure_ascii=False)
+
+    @staticmethod
+    def _row_to_task(row) -> DownloadTask:
+        job_id, task_json, priority, run_at, repeat_interval, status = row
+        data = json.loads(task_json)
+        if data.get("filters"):
+            data["filters"] = DownloadFilter.from_dict(data["filters"])
+        data.update(
+            job_id=job_id,
+            priority=priority,
+            repeat_interval=repeat_interval if repeat_interval and repeat_interval > 0 else None,
+            status=status,
+            scheduled_time=datetime.fromtimestamp(run_at)
+        )
+        return DownloadTask(**data)
+
+    def add(self, tasks: Iterable[DownloadTask], unique: bool = True) -> List[DownloadTask]:
+        """
+        เพิ่มงานเข้าคิวใน transaction เดียว (กำหนด job_id ให้ task)
+
+        unique=True จะไม่เพิ่มงานของช่องทางที่ยังมีงาน pending / downloading อยู่แล้ว
+        คืนค่ารายการงานที่ถูกเพิ่มจริง
+        """
+        tasks = list(tasks)
+        for task in tasks:
+            if task.repeat_interval is not None and task.repeat_interval <= 0:
+                raise ValueError(f"repeat_interval must be positive: {task.repeat_interval}")
+        now = time.time()
+        added = []
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for task in tasks:
+                if unique and conn.execute(
+                    f"SELECT 1 FROM jobs WHERE channel_id = ? AND status IN ({LIVE_PLACEHOLDERS})",
+                    (task.channel_id, *LIVE_STATUSES)
+                ).fetchone():
+                    continue
+                run_at = task.scheduled_time.timestamp() if task.scheduled_time else now
+                cursor = conn.execute(
+                    "INSERT INTO jobs (channel_id, task, priority, run_at, repeat_interval, status, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, 'pending', ?, ?)",
+                    (task.channel_id, self._task_json(task), task.priority, run_at, task.repeat_interval, now, now)
+                )
+                task.job_id = cursor.lastrowid
+                task.status = "pending"
+                added.append(task)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def claim(self, limit: int, exclude_channels: Iterable[str] = ()) -> List[DownloadTask]:
+        """
+        ดึงงานที่ถึงเวลาแล้วตามลำดับความสำคัญ และเปลี่ยนสถานะเป็น downloading
+        """
+        if limit <= 0:
+            return []
+        now = time.time()
+        exclude = set(exclude_channels)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            tasks = []
+            for row in conn.execute(
+                f"SELECT {self._COLUMNS} FROM jobs WHERE status = 'pending' AND run_at <= ? "
+                "ORDER BY priority DESC, run_at, id",
+                (now,)
+            ):
+                task = self._row_to_task(row)
+                if task.channel_id in exclude:
+                    continue
+                exclude.add(task.channel_id)
+                tasks.append(task)
+                if len(tasks) >= limit:
+                    break
+            for task in tasks:
+                conn.execute(
+                    "UPDATE jobs SET status = 'downloading', attempts = attempts + 1, updated_at = ?, "
+                    "owner = ?, lease_expires_at = ? WHERE id = ?",
+                    (now, self.owner, now + self.lease_duration, task.job_id)
+                )
+                task.status = "downloading"
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return tasks
+
+    def _set(self, job_id: int, status: str, run_at: Optional[float] = None, error: Optional[str] = None,
+             reset_attempts: bool = False) -> None:
+        assignments = ["status = ?", "error = ?", "updated_at = ?", "owner = NULL", "lease_expires_at = NULL"]
+        params: List = [status, error, time.time()]
+        if run_at is not None:
+            assignments.append("run_at = ?")
+            params.append(run_at)
+        if reset_attempts:
+            assignments.append("attempts = 0")
+        self._connect().execute(f"UPDATE jobs SET {', '.join(assignments)} WHERE id = ?", params + [job_id])
+
+    def _next_run(self, job_id: int) -> Optional[float]:
+        row = self._connect().execute("SELECT run_at, repeat_interval FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or not row[1] or row[1] <= 0:
+            return None
+        run_at, interval = row
+        now = time.time()
+        if run_at <= now:
+            # ข้ามรอบที่พลาดไประหว่างที่โปรแกรมไม่ได้ทำงาน (รอบถัดไปที่อยู่หลัง now)
+            run_at += (math.floor((now - run_at) / interval) + 1) * interval
+        return run_at
+
+    def complete(self, job_id: int) -> None:
+        """
+        บันทึกว่างานเสร็จแล้ว (งานที่ทำซ้ำจะถูกตั้งเวลารอบถัดไป)
+        """
+        next_run = self._next_run(job_id)
+        if next_run is None:
+            self._set(job_id, "completed")
+        else:
+            self._set(job_id, "pending", run_at=next_run, reset_attempts=True)
+
+    def fail(self, job_id: int, error: str) -> str:
+        """
+        บันทึกว่างานล้มเหลว ลองใหม่ภายหลังถ้ายังไม่เกิน max_attempts คืนค่าสถานะใหม่
+        """
+        row = self._connect().execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        attempts = row[0] if row else self.max_attempts
+        if attempts < self.max_attempts:
+            self._set(job_id, "pending", run_at=time.time() + self.retry_delay * 2 ** (attempts - 1), error=error)
+            return "pending"
+        next_run = self._next_run(job_id)
+        if next_run is not None:
+            self._set(job_id, "pending", run_at=next_run, error=error, reset_attempts=True)
+            return "pending"
+        self._set(job_id, "failed", error=error)
+        return "failed"
+
+    def update_task(self, task: DownloadTask) -> None:
+        """
+        บันทึกการตั้งค่าของงาน (เช่น bandwidth_limit ที่ปรับระหว่างทำงาน) ลงแถวของงาน task.job_id
+        """
+        self._connect().execute(
+            "UPDATE jobs SET task = ?, updated_at = ? WHERE id = ?",
+            (self._task_json(task), time.time(), task.job_id)
+        )
+
+    def requeue(self, job_id: int) -> None:
+        """
+        คืนงานที่ถูกขัดจังหวะ (เช่นปิดโปรแกรม) กลับเป็น pending โดยไม่นับเป็นการลองครั้งหนึ่ง
+        """
+        self._connect().execute(
+            "UPDATE jobs SET status = 'pending', attempts = MAX(attempts - 1, 0), updated_at = ?, "
+            "owner = NULL, lease_expires_at = NULL WHERE id = ? AND status = 'downloading'",
+            (time.time(), job_id)
+        )
+
+    def cancel(self, job_id: Optional[int] = None, channel_id: Optional[str] = None) -> None:
+        """
+        ยกเลิกงานตาม job_id หรือทุกงานที่ยังไม่จบของช่องทาง (ไม่ระบุอะไรเลย = ทุกงาน)
+        """
+        query = (
+            "UPDATE jobs SET status = 'cancelled', updated_at = ?, owner = NULL, lease_expires_at = NULL "
+            f"WHERE status IN ({LIVE_PLACEHOLDERS})"
+        )
+        params: List = [time.time(), *LIVE_STATUSES]
+        if job_id is not None:
+            query += " AND id = ?"
+            params.append(job_id)
+        if channel_id is not None:
+            query += " AND channel_id = ?"
+            params.append(str(channel_id))
+        self._connect().execute(query, params)
+
+    def heartbeat(self) -> int:
+        """
+        ต่ออายุ lease ของงานที่โปรเซสนี้กำลังทำ คืนค่าจำนวนงานที่ต่ออายุ
+        """
+        return self._connect().execute(
+            "UPDATE jobs SET lease_expires_at = ? WHERE owner = ? AND status = 'downloading'",
+            (time.time() + self.lease_duration, self.owner)
+        ).rowcount
+
+    def recover(self) -> int:
+        """
+        คืนงานที่ค้างสถานะ downloading และ lease หมดอายุแล้ว (จากโปรเซสที่ล่ม) กลับเป็น pending
+
+        งานที่โปรเซสอื่นยังทำอยู่ (lease ยังไม่หมดอายุ) จะไม่ถูกแตะ
+        """
+        now = time.time()
+        return self._connect().execute(
+            "UPDATE jobs SET status = 'pending', attempts = MAX(attempts - 1, 0), updated_at = ?, "
+            "owner = NULL, lease_expires_at = NULL "
+            "WHERE status = 'downloading' AND (lease_expires_at IS NULL OR lease_expires_at < ?)",
+            (now, now)
+        ).rowcount
+
+    def pending(self, offset: int = 0, limit: Optional[int] = None) -> List[DownloadTask]:
+        """
+        รายการงานที่รออยู่ เรียงตามลำดับที่จะถูกดึงไปทำ
+        """
+        rows = self._connect().execute(
+            f"SELECT {self._COLUMNS} FROM jobs WHERE status = 'pending' ORDER BY priority DESC, run_at, id "
+            "LIMIT ? OFFSET ?",
+            (-1 if limit is None else limit, offset)
+        ).fetchall()
+        return [self._row_to_task(row) for row in rows]
+
+    def count(self, status: str = "pending") -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (status,)).fetchone()[0]
+
+    def count_due(self, now: Optional[float] = None) -> int:
+        """
+        จำนวนงาน pending ที่ถึงกำหนดแล้ว
+        """
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = 'pending' AND run_at <= ?",
+            (time.time() if now is None else now,)
+        ).fetchone()[0]
+
+    def next_run_at(self, after: float = 0.0) -> Optional[float]:
+        """
+        เวลาที่เร็วที่สุดหลัง after ที่มีงาน pending จะถึงกำหนด (None ถ้าไม่มีงาน)
+        """
+        return self._connect().execute(
+            "SELECT MIN(run_at) FROM jobs WHERE status = 'pending' AND run_at > ?", (after,)
+        ).fetchone()[0]
+
+    def purge(self, older_than: float = 30 * 86400) -> None:
+        """
+        ลบงานที่จบแล้ว (completed / failed / cancelled) ที่เก่ากว่า older_than วินาที
+        """
+        self._connect().execute(
+            f"DELETE FROM jobs WHERE status NOT IN ({LIVE_PLACEHOLDERS}) AND updated_at < ?",
+            (*LIVE_STATUSES, time.time() - older_than)
+        )
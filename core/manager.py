@@ -0,0 +1,442 @@
+import time
+import asyncio
+import threading
+from dataclasses import asdict
+from datetime import datetime
+from concurrent.futures import Future
+from typing import Coroutine, Dict, Iterable, List, Optional, Union
+
+from .downloader import ChannelDownloader, ForumDownloader, DownloadResumer
+from .models import DownloadTask, DownloadFilter
+from .jobqueue import JobQueue
+from .http import DiscordSession, get_session, close_session
+from .events import ProgressStream
+from .progress import ProgressAggregator
+from .bandwidth import BandwidthLimiter, get_bandwidth_limiter
+from .blobstore import BlobStore
+
+class DownloadManager:
+    """
+    ตัวจัดการงานดาวน์โหลดหลายช่องทางบน event loop และ ClientSession เดียว
+
+    แต่ละงานเป็น asyncio task (ไม่ใช่ QThread ต่อช่องทาง) โดยจำกัด
+    - max_active_channels: จำนวนช่องทางที่ดาวน์โหลดพร้อมกัน
+    - max_concurrent_downloads: จำนวนไฟล์ที่ดาวน์โหลดพร้อมกันรวมทุกช่องทาง
+    - per_channel_downloads: จำนวนไฟล์ที่ดาวน์โหลดพร้อมกันในช่องทางเดียว
+    งานถูกเก็บใน JobQueue (jobs.db) ตามลำดับความสำคัญและเวลาที่กำหนด จึงคงอยู่หลังปิดโปรแกรม
+    และงานที่ค้างจากการปิดโปรแกรมหรือโปรเซสล่มจะถูกทำต่อเมื่อ lease ของงานหมดอายุ
+    (งานที่โปรเซสอื่นยังทำอยู่จะไม่ถูกดึงซ้ำ)
+    จุด resume ของแต่ละช่องทางถูกบันทึกทุก checkpoint_interval วินาทีหรือทุก checkpoint_every ไฟล์
+    ความคืบหน้าของทุกงานส่งออกทาง self.events (ProgressStream) ทุก progress_interval วินาที
+    ความเร็วดาวน์โหลดจำกัดได้ทั้งแบบรวม (get_bandwidth_limiter) และต่องาน (DownloadTask.bandwidth_limit)
+    และปรับได้ระหว่างทำงานด้วย set_bandwidth()
+    งานที่เปิด DownloadTask.dedup ใช้ BlobStore ชุดเดียวกัน ไฟล์แนบที่ซ้ำข้ามช่องทางจึงดาวน์โหลดและเก็บครั้งเดียว
+    เมธอดสาธารณะเรียกจาก thread อื่นได้ (เช่น DownloaderAPI หรือ UI)
+    """
+    poll_interval = 30.0  # วินาที ตรวจคิวซ้ำเผื่อมีงานถูกเพิ่มจากโปรเซสอื่น
+    def __init__(
+        self,
+        token: str,
+        max_active_channels: int = 4,
+        max_concurrent_downloads: int = 16,
+        per_channel_downloads: int = 5,
+        progress_interval: float = 0.5,
+        checkpoint_interval: float = 5.0,
+        checkpoint_every: int = 500,
+        job_queue: Optional[JobQueue] = None
+    ):
+        self.token = token
+        self.max_active_channels = max_active_channels
+        self.max_concurrent_downloads = max_concurrent_downloads
+        self.per_channel_downloads = per_channel_downloads
+        self.resumer = DownloadResumer()
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_every = checkpoint_every
+        self.events = ProgressStream(progress_interval)
+        self.jobs = job_queue or JobQueue()
+
+        self._lock = threading.Lock()
+        self._closing = False
+        self._active: Dict[str, DownloadTask] = {}
+        self._downloaders: Dict[str, ChannelDownloader] = {}
+        self._bandwidth: Dict[str, BandwidthLimiter] = {}
+        self._finished: List[DownloadTask] = []
+        self._idle = threading.Event()
+        self._idle.set()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session: Optional[DiscordSession] = None
+        self._download_limiter: Optional[asyncio.Semaphore] = None
+        self._blob_store: Optional[BlobStore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._ready = threading.Event()
+
+    def start(self) -> None:
+        """
+        เริ่ม event loop ของตัวจัดการใน thread แยก
+        """
+        if self._thread is not None:
+            return
+        self._closing = False
+        self.jobs.recover()
+        self._idle.clear()  # dispatcher จะ set เมื่อไม่มีงานที่ถึงกำหนด
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._setup(), self._loop).result()
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """
+        event loop ของตัวจัดการ (None ถ้ายังไม่ได้ start)
+        """
+        return self._loop
+
+    def run_coroutine(self, coro: Coroutine) -> Future:
+        """
+        ส่ง coroutine ไปทำงานบน event loop ของตัวจัดการ (เรียกจาก thread อื่น)
+        """
+        if self._loop is None:
+            raise Exception("DownloadManager is not started")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _setup(self) -> None:
+        self._session = get_session()
+        self._download_limiter = asyncio.Semaphore(self.max_concurrent_downloads)
+        self._wakeup = asyncio.Event()
+        self._ready.set()
+        asyncio.get_running_loop().create_task(self._dispatch())
+        asyncio.get_running_loop().create_task(self._heartbeat())
+        asyncio.get_running_loop().create_task(self.events.run())
+
+    async def _close(self) -> None:
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._blob_store:
+            self._blob_store.close()
+            self._blob_store = None
+        await close_session()
+
+    def shutdown(self) -> None:
+        """
+        หยุดงานที่กำลังทำ ปิด session และหยุด event loop
+
+        งานในคิวไม่ถูกยกเลิก งานที่กำลังทำจะกลับเป็น pending และทำต่อเมื่อ start() ครั้งถัดไป
+        """
+        if self._loop is None:
+            return
+        with self._lock:
+            self._closing = True
+            active = list(self._active.values())
+            downloaders = list(self._downloaders.values())
+        for downloader in downloaders:
+            downloader.stop()
+        asyncio.run_coroutine_threadsafe(self._close(), self._loop).result()
+        for task in active:
+            self.jobs.requeue(task.job_id)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = self._thread = None
+        self._ready.clear()
+
+    def _notify(self) -> None:
+        if self._loop is not None and self._ready.is_set():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    @staticmethod
+    def _to_task(task: Union[Dict, DownloadTask]) -> DownloadTask:
+        if isinstance(task, DownloadTask):
+            return task
+        scheduled_time = task.get('scheduled_time')
+        if isinstance(scheduled_time, str):
+            scheduled_time = datetime.fromisoformat(scheduled_time)
+        filters = task.get('filters')
+        if isinstance(filters, dict):
+            filters = DownloadFilter.from_dict(filters)
+        return DownloadTask(
+            channel_id=str(task['channel_id']),
+            channel_name=task['channel_name'],
+            channel_type=task.get('channel_type', 'text'),
+            guild_id=str(task['guild_id']),
+            scheduled_time=scheduled_time,
+            save_metadata=task.get('save_metadata', True),
+            incremental=task.get('incremental', False),
+            priority=int(task.get('priority', 0)),
+            repeat_interval=task.get('repeat_interval'),
+            bandwidth_limit=task.get('bandwidth_limit'),
+            filters=filters or None,
+            crawl_slices=int(task.get('crawl_slices', 1)),
+            dedup=bool(task.get('dedup', False))
+        )
+
+    @staticmethod
+    def _task_to_dict(task: DownloadTask) -> Dict:
+        data = asdict(task)
+        if task.scheduled_time:
+            data['scheduled_time'] = task.scheduled_time.isoformat()
+        if task.filters:
+            data['filters'] = task.filters.to_dict()
+        return data
+
+    def add_download_task(self, task: Union[Dict, DownloadTask]) -> Optional[DownloadTask]:
+        """
+        เพิ่มงานดาวน์โหลดเข้าคิว (รับได้ทั้ง dict และ DownloadTask)
+
+        คืนค่า None ถ้าช่องทางนี้มีงานที่ยังไม่จบอยู่ในคิวแล้ว
+        """
+        added = self.add_download_tasks([task])
+        return added[0] if added else None
+
+    def add_download_tasks(self, tasks: Iterable[Union[Dict, DownloadTask]]) -> List[DownloadTask]:
+        """
+        เพิ่มงานดาวน์โหลดหลายงานเข้าคิวถาวรในครั้งเดียว (ข้ามช่องทางที่มีงานค้างอยู่แล้ว)
+        """
+        added = self.jobs.add([self._to_task(task) for task in tasks])
+        if added:
+            self._idle.clear()
+            self._notify()
+        return added
+
+    def get_active_downloads(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """
+        รายการงานที่กำลังดาวน์โหลด (แบ่งหน้าด้วย offset / limit)
+        """
+        with self._lock:
+            tasks = list(self._active.values())
+        end = None if limit is None else offset + limit
+        return [self._task_to_dict(task) for task in tasks[offset:end]]
+
+    def get_download_queue(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """
+        รายการงานที่รอในคิว เรียงตามลำดับที่จะถูกทำ (แบ่งหน้าด้วย offset / limit)
+        """
+        return [self._task_to_dict(task) for task in self.jobs.pending(offset, limit)]
+
+    def count_downloads(self) -> Dict[str, int]:
+        """
+        จำนวนงานที่กำลังดาวน์โหลด รอในคิว และทำจบแล้ว
+        """
+        queued = self.jobs.count("pending")
+        with self._lock:
+            return {"active": len(self._active), "queued": queued, "finished": len(self._finished)}
+
+    def get_finished_downloads(self) -> List[Dict]:
+        """
+        รายการงานที่ทำจบแล้วตั้งแต่ start() (completed / pending / failed / cancelled)
+        """
+        with self._lock:
+            return [self._task_to_dict(task) for task in self._finished]
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        รอจนกว่าไม่มีงานที่ถึงกำหนดในคิวและไม่มีงานที่กำลังทำ (คืนค่า False ถ้าหมดเวลา timeout ก่อน)
+
+        งานที่ตั้งเวลาไว้ในอนาคตไม่นับ
+        """
+        return self._idle.wait(timeout)
+
+    def stop_download(self, channel_id: str) -> None:
+        """
+        หยุดงานของช่องทาง (ยกเลิกงานในคิวและหยุดงานที่กำลังทำ)
+        """
+        channel_id = str(channel_id)
+        self.jobs.cancel(channel_id=channel_id)
+        with self._lock:
+            downloader = self._downloaders.get(channel_id)
+        if downloader:
+            downloader.stop()
+        self._notify()
+
+    def stop_all_downloads(self) -> None:
+        """
+        หยุดงานทั้งหมดและยกเลิกทุกงานในคิว (รวมงานที่ตั้งเวลาและงานที่ทำซ้ำ)
+        """
+        self.jobs.cancel()
+        with self._lock:
+            downloaders = list(self._downloaders.values())
+        for downloader in downloaders:
+            downloader.stop()
+        self._notify()
+
+    def set_bandwidth(self, settings: Dict, channel_id: Optional[str] = None) -> Dict:
+        """
+        ปรับความเร็วดาวน์โหลดรวม หรือของงานที่กำลังทำของช่องทาง channel_id (มีผลทันที)
+
+        settings มีคีย์ rate, burst, schedule (คีย์ที่ไม่ระบุจะคงค่าเดิม) ค่าติดลบจะได้ ValueError
+        ความเร็วของงานถูกบันทึกลง JobQueue ด้วย
+        คืนค่าสถานะของตัวจำกัดความเร็วที่ถูกปรับ
+        """
+        task = None
+        if channel_id is None:
+            limiter = get_bandwidth_limiter()
+        else:
+            channel_id = str(channel_id)
+            with self._lock:
+                limiter = self._bandwidth.get(channel_id)
+                task = self._active.get(channel_id)
+            if limiter is None:
+                raise Exception(f"No active download for channel {channel_id}")
+        limiter.configure(**{key: settings[key] for key in ("rate", "burst", "schedule") if key in settings})
+        if task is not None:
+            task.bandwidth_limit = limiter.rate
+            if task.job_id is not None:
+                self.jobs.update_task(task)  # รอบถัดไปของงานและงานที่กลับมาทำต่อใช้ความเร็วเดิม
+        return limiter.status()
+
+    def get_bandwidth(self) -> Dict:
+        """
+        สถานะของตัวจำกัดความเร็วรวมและของแต่ละงานที่กำลังทำ
+        """
+        with self._lock:
+            channels = {channel_id: limiter.status() for channel_id, limiter in self._bandwidth.items()}
+        return {"global": get_bandwidth_limiter().status(), "channels": channels}
+
+    def get_concurrency(self) -> Dict[str, Dict]:
+        """
+        สถานะของตัวปรับจำนวนงานพร้อมกัน (ไฟล์และ API request) ของแต่ละงานที่กำลังทำ
+        """
+        with self._lock:
+            downloaders = dict(self._downloaders)
+        return {channel_id: downloader.concurrency_status() for channel_id, downloader in downloaders.items()}
+
+    async def _dispatch(self) -> None:
+        """
+        ดึงงานที่ถึงกำหนดจากคิวไปทำเมื่อมีช่องว่าง และรอจนถึงเวลาของงานถัดไป
+        """
+        while True:
+            self._wakeup.clear()
+            with self._lock:
+                free = self.max_active_channels - len(self._active)
+                active_channels = list(self._active)
+            # JobQueue อาจรอ lock ของ SQLite (เช่น จากโปรเซสอื่น) จึงเรียกใน thread แยก
+            # เพื่อไม่ให้การดาวน์โหลดและ event stream บน loop นี้หยุดรอ
+            tasks = await asyncio.to_thread(self.jobs.claim, free, active_channels)
+            with self._lock:
+                for task in tasks:
+                    self._active[task.channel_id] = task
+            for task in tasks:
+                asyncio.get_running_loop().create_task(self._run_task(task))
+
+            now = time.time()
+            next_run = await asyncio.to_thread(self.jobs.next_run_at, now)
+            due = await asyncio.to_thread(self.jobs.count_due, now)
+            with self._lock:
+                if not self._active and not due:
+                    self._idle.set()
+            timeout = self.poll_interval if next_run is None else min(next_run - now, self.poll_interval)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _heartbeat(self) -> None:
+        """
+        ต่ออายุ lease ของงานที่กำลังทำ และคืนงานของโปรเซสที่หยุดทำงาน (lease หมดอายุ) เข้าคิว
+        """
+        while True:
+            await asyncio.sleep(self.jobs.lease_duration / 3)
+            await asyncio.to_thread(self.jobs.heartbeat)
+            if await asyncio.to_thread(self.jobs.recover):
+                self._wakeup.set()
+
+    def _create_downloader(self, task: DownloadTask) -> ChannelDownloader:
+        downloader_class = ForumDownloader if task.channel_type == "forum" else ChannelDownloader
+        bandwidth_limiter = BandwidthLimiter(task.bandwidth_limit)
+        with self._lock:
+            self._bandwidth[task.channel_id] = bandwidth_limiter
+        if task.dedup and self._blob_store is None:
+            self._blob_store = BlobStore()
+        return downloader_class(
+            self.token,
+            task.guild_id,
+            task.save_metadata,
+            max_concurrent_downloads=self.per_channel_downloads,
+            download_limiter=self._download_limiter,
+            bandwidth_limiter=bandwidth_limiter,
+            filters=task.filters,
+            blob_store=self._blob_store if task.dedup else None
+        )
+
+    async def _run_task(self, task: DownloadTask) -> None:
+        """
+        ทำงานดาวน์โหลดหนึ่งงานบน session ที่ใช้ร่วมกัน
+        """
+        downloader = self._create_downloader(task)
+        with self._lock:
+            self._downloaders[task.channel_id] = downloader
+        self.events.track(task.channel_id, downloader)
+        self.events.publish(task.channel_id, "started", channel_name=task.channel_name, channel_type=task.channel_type)
+
+        def update_progress(current: int, total: int, message: str) -> None:
+            task.downloaded_files = current
+            task.total_files = total
+            task.progress = current / total * 100 if total else 0.0
+            self.events.publish(
+                task.channel_id, "progress",
+                downloaded_files=current, total_files=total, progress=task.progress, message=message
+            )
+
+        checkpoints = ProgressAggregator(
+            on_checkpoint=lambda state: self.resumer.record(task.channel_id, state),
+            checkpoint_interval=self.checkpoint_interval,
+            checkpoint_every=self.checkpoint_every
+        )
+        checkpoints.downloader = downloader
+
+        def update_checkpoint(last_message_id: str) -> None:
+            if downloader.is_running:
+                checkpoints.update(task.downloaded_files, task.total_files, "")
+                checkpoints.checkpoint(last_message_id)
+
+        try:
+            if task.channel_type == "forum":
+                # Thread ถูกดาวน์โหลดพร้อมกันจึงไม่มี ID ข้อความเดียวให้ checkpoint
+                # การดาวน์โหลดต่อใช้ manifest และ high-water mark ของแต่ละ Thread แทน
+                await downloader.download_forum_channel(
+                    self._session, {"id": task.channel_id, "name": task.channel_name}, update_progress,
+                    incremental=task.incremental
+                )
+            else:
+                state = self.resumer.load_channel(task.channel_id)
+                try:
+                    await downloader.download_attachments_from_channel(
+                        self._session,
+                        task.channel_id,
+                        task.channel_name,
+                        progress_callback=update_progress,
+                        start_from=state.get("last_message_id") if state else None,
+                        checkpoint_callback=update_checkpoint,
+                        incremental=task.incremental,
+                        slices=task.crawl_slices
+                    )
+                finally:
+                    checkpoints.flush()
+            if downloader.is_running:
+                task.status = "completed"
+                self.resumer.clear_channel(task.channel_id)
+                await asyncio.to_thread(self.jobs.complete, task.job_id)
+                self.events.publish(task.channel_id, "completed", downloaded_files=task.downloaded_files)
+            elif self._closing:
+                task.status = "pending"
+                await asyncio.to_thread(self.jobs.requeue, task.job_id)
+                self.events.publish(task.channel_id, "stopped", downloaded_files=task.downloaded_files)
+            else:
+                task.status = "cancelled"
+                await asyncio.to_thread(self.jobs.cancel, task.job_id)
+                self.events.publish(task.channel_id, "stopped", downloaded_files=task.downloaded_files)
+        except Exception as e:
+            print(f"Error downloading {task.channel_name}: {str(e)}")
+            task.status = await asyncio.to_thread(self.jobs.fail, task.job_id, str(e))
+            self.events.publish(task.channel_id, "error", message=str(e))
+        finally:
+            with self._lock:
+                self._active.pop(task.channel_id, None)
+                self._downloaders.pop(task.channel_id, None)
+                self._bandwidth.pop(task.channel_id, None)
+                self._finished.append(task)
+            self._wakeup.set()
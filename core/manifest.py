@@ -0,0 +1,113 @@
+import os
+import time
+import asyncio
+from typing import Dict, Optional
+
+from .storage import SQLiteStore
+from .utils import file_sha256
+
+class ChannelManifest(SQLiteStore):
+    """
+    ดัชนีไฟล์แนบที่ดาวน์โหลดแล้วของช่องทางหนึ่ง
+
+    เก็บขนาด, checksum (SHA-256) และตำแหน่งไฟล์ โดยใช้ ID ของไฟล์แนบเป็น key
+    ไว้ในไฟล์ manifest.db ภายในโฟลเดอร์ของช่องทาง
+    ไฟล์แนบที่มีอยู่แล้วและตรวจสอบผ่านจะถูกข้ามโดยไม่ต้องส่ง request ไปยัง CDN
+    """
+    FILENAME = "manifest.db"
+
+    def __init__(self, folder: str, verify_checksums: bool = False):
+        super().__init__(os.path.join(folder, self.FILENAME))
+        self.folder = folder
+        self.verify_checksums = verify_checksums
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS attachments ("
+            "id TEXT PRIMARY KEY, "
+            "filename TEXT NOT NULL, "
+            "path TEXT NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "sha256 TEXT NOT NULL, "
+            "downloaded_at REAL NOT NULL)"
+        )
+        self._connect().execute("CREATE INDEX IF NOT EXISTS attachments_path ON attachments (path)")
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS sync_state (name TEXT PRIMARY KEY, value TEXT)"
+        )
+
+    def get(self, attachment_id: str) -> Optional[Dict]:
+        """
+        ดึงข้อมูลของไฟล์แนบจาก manifest
+        """
+        row = self._connect().execute(
+            "SELECT id, filename, path, size, sha256, downloaded_at FROM attachments WHERE id = ?",
+            (str(attachment_id),)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("id", "filename", "path", "size", "sha256", "downloaded_at"), row))
+
+    def add(self, attachment_id: str, filename: str, path: str, size: int, sha256: str) -> None:
+        """
+        บันทึกไฟล์แนบที่ดาวน์โหลดเสร็จแล้ว (path เป็น path สัมพัทธ์กับโฟลเดอร์ของช่องทาง)
+        """
+        self._connect().execute(
+            "INSERT OR REPLACE INTO attachments (id, filename, path, size, sha256, downloaded_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (str(attachment_id), filename, path, size, sha256, time.time())
+        )
+
+    def owner(self, path: str) -> Optional[str]:
+        """
+        คืนค่า ID ของไฟล์แนบที่ใช้ path นี้ (None = ยังไม่มีไฟล์แนบใดใช้)
+        """
+        row = self._connect().execute("SELECT id FROM attachments WHERE path = ?", (path,)).fetchone()
+        return row[0] if row else None
+
+    def remove(self, attachment_id: str) -> None:
+        """
+        ลบไฟล์แนบออกจาก manifest
+        """
+        self._connect().execute("DELETE FROM attachments WHERE id = ?", (str(attachment_id),))
+
+    async def is_downloaded(self, attachment: Dict) -> bool:
+        """
+        ตรวจสอบว่าไฟล์แนบนี้ดาวน์โหลดไว้แล้วและไฟล์บนดิสก์ยังถูกต้อง
+
+        ตรวจขนาดไฟล์เสมอ และตรวจ checksum ด้วยถ้าเปิด verify_checksums
+        (คำนวณใน thread แยกเพื่อไม่ให้ event loop ค้างระหว่างอ่านไฟล์ขนาดใหญ่)
+        """
+        if "id" not in attachment:
+            return False
+        entry = self.get(attachment["id"])
+        if entry is None:
+            return False
+        if attachment.get("size") is not None and attachment["size"] != entry["size"]:
+            return False
+
+        local_path = os.path.join(self.folder, entry["path"])
+        try:
+            if os.path.getsize(local_path) != entry["size"]:
+                return False
+        except OSError:
+            return False
+        if not self.verify_checksums:
+            return True
+        return await asyncio.to_thread(file_sha256, local_path) == entry["sha256"]
+
+    def get_sync_state(self, name: str) -> Optional[str]:
+        """
+        อ่านค่าสถานะการ sync ของช่องทาง (เช่น high_water_mark)
+        """
+        row = self._connect().execute("SELECT value FROM sync_state WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_sync_state(self, name: str, value: Optional[str]) -> None:
+        """
+        บันทึกค่าสถานะการ sync ของช่องทาง (None = ลบค่า)
+        """
+        if value is None:
+            self._connect().execute("DELETE FROM sync_state WHERE name = ?", (name,))
+        else:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO sync_state (name, value) VALUES (?, ?)", (name, str(value))
+            )
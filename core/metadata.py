@@ -0,0 +1,140 @@
+import os
+import json
+import queue
+import threading
+from typing import Dict, List, Optional
+
+from .storage import SQLiteStore
+
+class MetadataSink(SQLiteStore):
+    """
+    ตัวเขียน metadata ของข้อความแบบ batch ใน thread แยก
+
+    ข้อความจะถูกเขียนต่อท้ายไฟล์ JSONL ที่แบ่งเป็น segment (segment-00000.jsonl, ...)
+    โดยมี index.db เก็บตำแหน่งของแต่ละข้อความไว้สำหรับอ่านกลับทีละข้อความ
+    write() แค่ส่งข้อมูลเข้าคิว จึงไม่บล็อก event loop ของการดาวน์โหลด
+    """
+    _STOP = object()
+
+    def __init__(self, folder: str, segment_size: int = 100000, batch_size: int = 500, flush_interval: float = 1.0):
+        os.makedirs(folder, exist_ok=True)
+        super().__init__(os.path.join(folder, "index.db"))
+        self.folder = folder
+        self.segment_size = segment_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS messages ("
+            "id TEXT PRIMARY KEY, "
+            "segment INTEGER NOT NULL, "
+            "offset INTEGER NOT NULL, "
+            "length INTEGER NOT NULL)"
+        )
+
+    def segment_path(self, segment: int) -> str:
+        return os.path.join(self.folder, f"segment-{segment:05d}.jsonl")
+
+    def write(self, record: Dict) -> None:
+        """
+        ส่ง metadata ของข้อความหนึ่งข้อความเข้าคิวเพื่อเขียนลงดิสก์
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._queue.put(record)
+
+    def flush(self) -> None:
+        """
+        รอจนกว่าข้อมูลทั้งหมดในคิวจะถูกเขียนลงดิสก์
+        """
+        self._queue.join()
+
+    def close(self) -> None:
+        """
+        เขียนข้อมูลที่ค้างอยู่ให้หมดแล้วหยุด thread เขียน
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(self._STOP)
+            thread.join()
+        super().close()
+
+    def get(self, message_id: str) -> Optional[Dict]:
+        """
+        อ่าน metadata ของข้อความเดียวกลับมาจาก segment
+        """
+        row = self._connect().execute(
+            "SELECT segment, offset, length FROM messages WHERE id = ?", (str(message_id),)
+        ).fetchone()
+        if row is None:
+            return None
+        segment, offset, length = row
+        with open(self.segment_path(segment), "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length).decode("utf-8"))
+
+    def _current_segment(self):
+        row = self._connect().execute(
+            "SELECT segment, COUNT(*) FROM messages WHERE segment = (SELECT MAX(segment) FROM messages)"
+        ).fetchone()
+        if row is None or row[0] is None:
+            return 0, 0
+        return row[0], row[1]
+
+    def _run(self) -> None:
+        segment, count = self._current_segment()
+        stopping = False
+        while not stopping:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [record for record in batch if record is not self._STOP]
+            stopping = len(records) != len(batch)
+            try:
+                segment, count = self._write_batch(records, segment, count)
+            except Exception as e:
+                print(f"Failed to write message metadata: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        super().close()
+
+    def _write_batch(self, records: List[Dict], segment: int, count: int):
+        rows = []
+        f = None
+        try:
+            for record in records:
+                if f is None or count >= self.segment_size:
+                    if count >= self.segment_size:
+                        segment, count = segment + 1, 0
+                    if f is not None:
+                        f.close()
+                    f = open(self.segment_path(segment), "ab")
+                data = json.dumps(record, ensure_ascii=False).encode("utf-8")
+                offset = f.tell()
+                f.write(data + b"\n")
+                rows.append((str(record["id"]), segment, offset, len(data)))
+                count += 1
+        finally:
+            if f is not None:
+                f.close()
+
+        conn = self._connect()
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT OR REPLACE INTO messages (id, segment, offset, length) VALUES (?, ?, ?, ?)", rows
+        )
+        conn.execute("COMMIT")
+        return segment, count
@@ -1,60 +1,118 @@
-from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional, Dict
-
-@dataclass
-class DownloadTask:
-    """
-    โมเดลสำหรับงานดาวน์โหลด
-    """
-    channel_id: str
-    channel_name: str
-    channel_type: str  # "text", "forum", "thread"
-    guild_id: str
-    scheduled_time: Optional[datetime] = None
-    save_metadata: bool = True
-    status: str = "pending"  # "pending", "downloading", "completed", "failed"
-    progress: float = 0.0
-    downloaded_files: int = 0
-    total_files: int = 0
-
-@dataclass
-class FileMetadata:
-    """
-    โมเดลสำหรับ metadata ของไฟล์
-    """
-    id: str
-    filename: str
-    path: str
-    size: int
-    file_type: str
-    message_id: str
-    channel_id: str
-    guild_id: str
-    author_id: str
-    timestamp: datetime
-    tags: List[str] = None
-    downloaded_at: datetime = None
-
-@dataclass
-class GuildInfo:
-    """
-    โมเดลสำหรับข้อมูล Guild
-    """
-    id: str
-    name: str
-    icon: Optional[str]
-    channels: List['ChannelInfo'] = None
-
-@dataclass
-class ChannelInfo:
-    """
-    โมเดลสำหรับข้อมูล Channel
-    """
-    id: str
-    name: str
-    type: int  # 0 = text, 2 = voice, 4 = category, 5 = announcement, 15 = forum
-    parent_id: Optional[str]
-    position: int
-    topic: Optional[str]
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import List, Optional, Dict
+
+@dataclass
+class DownloadFilter:
+    """
+    ตัวกรองของงานดาวน์โหลด (None / list ว่าง = ไม่กรอง)
+
+    ช่วงวันที่ถูกแปลงเป็น snowflake และใช้เป็น cursor before / after โดยตรง ส่วนตัวกรองอื่น
+    ตรวจจากข้อมูลของไฟล์แนบก่อนส่ง request ไปยัง CDN
+    """
+    after: Optional[datetime] = None   # เฉพาะข้อความหลังเวลานี้
+    before: Optional[datetime] = None  # เฉพาะข้อความก่อนเวลานี้
+    days: Optional[float] = None       # เฉพาะ N วันล่าสุด นับจากเวลาเริ่มงาน (เหมาะกับงานที่ทำซ้ำ)
+    extensions: List[str] = field(default_factory=list)     # เช่น ["mp4", "webm"]
+    content_types: List[str] = field(default_factory=list)  # เช่น ["video/*", "image/png"]
+    min_size: Optional[int] = None  # byte
+    max_size: Optional[int] = None  # byte
+    authors: List[str] = field(default_factory=list)  # ID หรือ username ของผู้ส่ง
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        for key in ("after", "before"):
+            if data[key] is not None:
+                data[key] = data[key].isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DownloadFilter':
+        """
+        สร้างจาก dict (เช่น JSON ของ API หรือ config) วันที่เป็น ISO 8601
+        """
+        values = {}
+        for key in ("after", "before"):
+            if data.get(key):
+                value = data[key]
+                values[key] = value if isinstance(value, datetime) else datetime.fromisoformat(value)
+        if data.get("days"):
+            values["days"] = float(data["days"])
+        for key in ("min_size", "max_size"):
+            if data.get(key) is not None:
+                values[key] = int(data[key])
+        values["extensions"] = [str(ext).lower().lstrip(".") for ext in data.get("extensions") or []]
+        values["content_types"] = [str(content_type).lower() for content_type in data.get("content_types") or []]
+        values["authors"] = [str(author) for author in data.get("authors") or []]
+        return cls(**values)
+
+@dataclass
+class DownloadTask:
+    """
+    โมเดลสำหรับงานดาวน์โหลด
+    """
+    channel_id: str
+    channel_name: str
+    channel_type: str  # "text", "forum", "thread"
+    guild_id: str
+    scheduled_time: Optional[datetime] = None
+    save_metadata: bool = True
+    incremental: bool = False  # ดึงเฉพาะข้อความใหม่กว่าครั้งล่าสุด
+    priority: int = 0  # ค่ามากกว่าทำก่อน
+    repeat_interval: Optional[float] = None  # ทำซ้ำทุกกี่วินาที (None = ครั้งเดียว)
+    bandwidth_limit: Optional[float] = None  # byte ต่อวินาทีของงานนี้ (None = ไม่จำกัด นอกจากค่ารวม)
+    filters: Optional[DownloadFilter] = None
+    crawl_slices: int = 1  # จำนวนช่วงเวลาที่ดึงรายการข้อความพร้อมกัน (สำหรับช่องทางขนาดใหญ่)
+    dedup: bool = False  # เก็บไฟล์ใน BlobStore ร่วมกับช่องทางอื่น (ไฟล์ซ้ำเก็บชุดเดียว)
+    job_id: Optional[int] = None  # ID ใน JobQueue
+    status: str = "pending"  # "pending", "downloading", "completed", "failed", "cancelled"
+    progress: float = 0.0
+    downloaded_files: int = 0
+    total_files: int = 0
+
+    def __post_init__(self):
+        if self.repeat_interval is not None and self.repeat_interval <= 0:
+            raise ValueError(f"repeat_interval must be positive: {self.repeat_interval}")
+        if self.bandwidth_limit is not None and self.bandwidth_limit < 0:
+            raise ValueError(f"bandwidth_limit must not be negative: {self.bandwidth_limit}")
+
+@dataclass
+class FileMetadata:
+    """
+    โมเดลสำหรับ metadata ของไฟล์
+    """
+    id: str
+    filename: str
+    path: str
+    size: int
+    file_type: str
+    message_id: str
+    channel_id: str
+    guild_id: str
+    author_id: str
+    timestamp: datetime
+    tags: List[str] = None
+    downloaded_at: datetime = None
+
+@dataclass
+class GuildInfo:
+    """
+    โมเดลสำหรับข้อมูล Guild
+    """
+    id: str
+    name: str
+    icon: Optional[str]
+    channels: List['ChannelInfo'] = None
+
+@dataclass
+class ChannelInfo:
+    """
+    โมเดลสำหรับข้อมูล Channel
+    """
+    id: str
+    name: str
+    type: int  # 0 = text, 2 = voice, 4 = category, 5 = announcement, 15 = forum
+    parent_id: Optional[str]
+    position: int
+    topic: Optional[str]
     nsfw: bool = False
\ No newline at end of file
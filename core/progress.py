@@ -0,0 +1,110 @@
+import time
+import asyncio
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+class ProgressAggregator:
+    """
+    รวมการอัปเดตความคืบหน้าและการบันทึกจุด resume ให้เกิดในอัตราคงที่
+
+    ใช้แทน progress_callback / checkpoint_callback ของ ChannelDownloader
+    - on_progress(current, total, bytes_downloaded, message) ถูกเรียกไม่เกินหนึ่งครั้งต่อ interval วินาที
+      (ค่าล่าสุดจะถูกส่งตามไปภายใน interval เสมอ)
+    - on_checkpoint(state) ถูกเรียกเมื่อผ่านไป checkpoint_interval วินาที หรือดาวน์โหลดเพิ่ม
+      checkpoint_every ไฟล์นับจากครั้งก่อน แล้วแต่อย่างใดถึงก่อน
+    เรียก flush() เมื่อจบงานเพื่อส่งค่าสุดท้ายและบันทึกจุด resume ที่ค้างอยู่
+    ต้องเรียกจาก thread ของ event loop เท่านั้น
+    """
+    def __init__(
+        self,
+        on_progress: Optional[Callable[[int, int, int, str], None]] = None,
+        on_checkpoint: Optional[Callable[[Dict], None]] = None,
+        interval: float = 0.25,
+        checkpoint_interval: float = 5.0,
+        checkpoint_every: int = 500
+    ):
+        self.on_progress = on_progress
+        self.on_checkpoint = on_checkpoint
+        self.interval = interval
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_every = checkpoint_every
+        self.downloader = None  # ถ้ากำหนด จะอ่านจำนวน byte จาก downloader.bytes_downloaded
+
+        self.current = 0
+        self.total = 0
+        self.message = ""
+        self._last_emit = 0.0
+        self._emit_handle: Optional[asyncio.TimerHandle] = None
+        self._dirty = False
+
+        self._cursor: Optional[str] = None
+        self._last_checkpoint = time.monotonic()
+        self._checkpointed_files = 0
+
+    @property
+    def bytes_downloaded(self) -> int:
+        return self.downloader.bytes_downloaded if self.downloader is not None else 0
+
+    def update(self, current: int, total: int, message: str) -> None:
+        """
+        progress_callback: บันทึกค่าล่าสุดและส่งออกเมื่อครบ interval
+        """
+        self.current, self.total, self.message = current, total, message
+        self._dirty = True
+        if self.on_progress is None or self._emit_handle is not None:
+            return
+        wait = self._last_emit + self.interval - time.monotonic()
+        if wait <= 0:
+            self._emit()
+        else:
+            self._emit_handle = asyncio.get_running_loop().call_later(wait, self._emit)
+
+    def _emit(self) -> None:
+        self._emit_handle = None
+        if not self._dirty:
+            return
+        self._dirty = False
+        self._last_emit = time.monotonic()
+        self.on_progress(self.current, self.total, self.bytes_downloaded, self.message)
+
+    def checkpoint(self, last_message_id: str) -> None:
+        """
+        checkpoint_callback: จำจุด resume ล่าสุดและบันทึกเมื่อถึงงบเวลาหรือจำนวนไฟล์
+        """
+        self._cursor = last_message_id
+        if (time.monotonic() - self._last_checkpoint >= self.checkpoint_interval
+                or self.current - self._checkpointed_files >= self.checkpoint_every):
+            self._write_checkpoint()
+
+    def state(self) -> Dict:
+        """
+        สถานะปัจจุบันในรูปแบบที่ DownloadResumer เก็บ
+        """
+        state = {
+            "downloaded_files": self.current,
+            "total_files": self.total,
+            "bytes_downloaded": self.bytes_downloaded,
+            "timestamp": datetime.now().isoformat()
+        }
+        if self._cursor is not None:
+            state["last_message_id"] = self._cursor
+        return state
+
+    def _write_checkpoint(self) -> None:
+        self._last_checkpoint = time.monotonic()
+        self._checkpointed_files = self.current
+        if self.on_checkpoint is not None and self._cursor is not None:
+            self.on_checkpoint(self.state())
+        self._cursor = None
+
+    def flush(self) -> None:
+        """
+        ส่งความคืบหน้าล่าสุดและบันทึกจุด resume ที่ยังค้างอยู่ทันที
+        """
+        if self._emit_handle is not None:
+            self._emit_handle.cancel()
+            self._emit_handle = None
+        if self.on_progress is not None:
+            self._emit()
+        if self._cursor is not None:
+            self._write_checkpoint()
@@ -0,0 +1,203 @@
+import asyncio
+from typing import Dict, Optional
+from PyQt6.QtCore import QObject, QThread, QUrl, pyqtSignal
+from .downloader import ChannelDownloader, DownloadResumer
+from .blobstore import BlobStore
+from .models import DownloadFilter
+from .progress import ProgressAggregator
+from .http import get_session, close_session
+
+class DiscordOAuth(QObject):
+    """
+    ระบบ Login ด้วย Discord OAuth
+    """
+    login_success = pyqtSignal(str)  # ส่ง token เมื่อล็อกอินสำเร็จ
+    login_failed = pyqtSignal(str)   # ส่งข้อความ error เมื่อล็อกอินล้มเหลว
+
+    def __init__(self, client_id, redirect_uri, scopes):
+        super().__init__()
+        self.client_id = client_id
+        self.redirect_uri = redirect_uri
+        self.scopes = scopes
+        self.token = None
+
+    def create_oauth_window(self):
+        """
+        สร้างหน้าต่าง OAuth
+        """
+        # import QtWebEngine เมื่อเปิดหน้าต่าง OAuth ครั้งแรกเท่านั้น
+        from PyQt6.QtWebEngineWidgets import QWebEngineView
+        from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
+
+        self.webview = QWebEngineView()
+        self.profile = QWebEngineProfile("oauth_profile", self.webview)
+        self.profile.setPersistentCookiesPolicy(QWebEngineProfile.PersistentCookiesPolicy.NoPersistentCookies)
+        
+        self.webview.setPage(QWebEnginePage(self.profile, self.webview))
+        oauth_url = f"https://discord.com/api/oauth2/authorize?client_id={self.client_id}&redirect_uri={self.redirect_uri}&response_type=code&scope={' '.join(self.scopes)}"
+        self.webview.load(QUrl(oauth_url))
+        self.webview.urlChanged.connect(self._check_redirect)
+        
+        return self.webview
+
+    def _check_redirect(self, url):
+        """
+        ตรวจสอบเมื่อมีการ redirect กลับมาจาก Discord
+        """
+        if "code=" in url.toString():
+            code = self._extract_code_from_url(url)
+            self._exchange_code_for_token(code)
+
+    def _extract_code_from_url(self, url):
+        """
+        ดึง code จาก URL
+        """
+        return url.toString().split("code=")[1].split("&")[0]
+
+    async def _exchange_code_for_token(self, code):
+        """
+        แลก code เป็น token (ควรใช้ backend server จริง)
+        """
+        try:
+            session = get_session()
+            data = {
+                'client_id': self.client_id,
+                'client_secret': 'YOUR_CLIENT_SECRET',
+                'grant_type': 'authorization_code',
+                'code': code,
+                'redirect_uri': self.redirect_uri,
+                'scope': ' '.join(self.scopes)
+            }
+            
+            async with session.post('https://discord.com/api/oauth2/token', data=data) as resp:
+                if resp.status == 200:
+                    token_data = await resp.json()
+                    self.token = token_data.get('access_token')
+                    self.login_success.emit(self.token)
+                else:
+                    error = await resp.text()
+                    self.login_failed.emit(f"Failed to get token: {error}")
+        except Exception as e:
+            self.login_failed.emit(f"Error: {str(e)}")
+
+class DownloadWorker(QThread):
+    """
+    Worker สำหรับดาวน์โหลดไฟล์ใน Thread แยก
+
+    signal ความคืบหน้าและการบันทึกจุด resume ถูกรวมด้วย ProgressAggregator
+    จึงมีจำนวนคงที่ไม่ว่าไฟล์จะดาวน์โหลดเสร็จเร็วแค่ไหน
+    """
+    progress_interval = 0.25    # วินาทีขั้นต่ำระหว่าง signal ความคืบหน้า
+    checkpoint_interval = 5.0   # บันทึกจุด resume อย่างน้อยทุกกี่วินาที
+    checkpoint_every = 500      # หรือทุกกี่ไฟล์
+
+    progress_updated = pyqtSignal(int, int, str)  # current, total, message
+    bytes_updated = pyqtSignal(object)            # bytes downloaded
+    download_complete = pyqtSignal(str)           # channel_name
+    error_occurred = pyqtSignal(str)             # error_message
+
+    def __init__(self, token: str, guild_id: str, channel_id: str, channel_name: str, save_metadata: bool = True,
+                 max_concurrent_downloads: int = 5, incremental: bool = False, dedup: bool = False,
+                 filters: Optional[DownloadFilter] = None, crawl_slices: int = 1):
+        super().__init__()
+        self.token = token
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.channel_name = channel_name
+        self.save_metadata = save_metadata
+        self.max_concurrent_downloads = max_concurrent_downloads
+        self.incremental = incremental
+        self.dedup = dedup
+        self.filters = filters
+        self.crawl_slices = crawl_slices
+        self.resumer = DownloadResumer()
+        self.state = self._load_resume_state()
+        self._is_running = True
+        self._downloader = None
+        self._progress = ProgressAggregator(
+            self._update_progress,
+            self._save_resume_state,
+            interval=self.progress_interval,
+            checkpoint_interval=self.checkpoint_interval,
+            checkpoint_every=self.checkpoint_every
+        )
+
+    def _load_resume_state(self) -> Optional[Dict]:
+        """
+        โหลดสถานะการดาวน์โหลดที่ค้างไว้
+        """
+        return self.resumer.load_channel(self.channel_id)
+
+    def _save_resume_state(self, progress: Dict) -> None:
+        """
+        บันทึกสถานะการดาวน์โหลดปัจจุบัน
+        """
+        self.resumer.record(self.channel_id, progress)
+
+    def stop(self) -> None:
+        """
+        หยุดการดาวน์โหลด
+        """
+        self._is_running = False
+        if self._downloader:
+            self._downloader.stop()
+
+    def run(self) -> None:
+        """
+        เริ่มการดาวน์โหลด
+        """
+        try:
+            asyncio.run(self._download())
+        except Exception as e:
+            self.error_occurred.emit(f"Error downloading {self.channel_name}: {str(e)}")
+
+    async def _download(self) -> None:
+        """
+        ดาวน์โหลดไฟล์จากช่องทาง
+        """
+        try:
+            downloader = ChannelDownloader(
+                self.token, self.guild_id, self.save_metadata,
+                max_concurrent_downloads=self.max_concurrent_downloads,
+                blob_store=BlobStore() if self.dedup else None,
+                filters=self.filters
+            )
+            self._downloader = downloader
+            self._progress.downloader = downloader
+            start_from = self.state["last_message_id"] if self.state else None
+
+            try:
+                await downloader.download_attachments_from_channel(
+                    get_session(),
+                    self.channel_id,
+                    self.channel_name,
+                    progress_callback=self._progress.update,
+                    start_from=start_from,
+                    checkpoint_callback=self._update_checkpoint,
+                    incremental=self.incremental,
+                    slices=self.crawl_slices
+                )
+            finally:
+                self._progress.flush()
+                await close_session()
+
+            if self._is_running:
+                self.resumer.clear_channel(self.channel_id)
+            self.download_complete.emit(f"Download complete: {self.channel_name}")
+        except Exception as e:
+            self.error_occurred.emit(f"Error downloading {self.channel_name}: {str(e)}")
+
+    def _update_progress(self, current: int, total: int, bytes_downloaded: int, message: str) -> None:
+        """
+        อัปเดตความคืบหน้า (ถูกเรียกผ่าน ProgressAggregator ไม่เกินหนึ่งครั้งต่อ progress_interval)
+        """
+        if self._is_running:
+            self.progress_updated.emit(current, total, message)
+            self.bytes_updated.emit(bytes_downloaded)
+
+    def _update_checkpoint(self, last_message_id: str) -> None:
+        """
+        บันทึกจุด resume เมื่อไฟล์แนบทุกไฟล์ในหน้านั้นดาวน์โหลดเสร็จแล้ว (ตามงบเวลา/จำนวนไฟล์)
+        """
+        if self._is_running:
+            self._progress.checkpoint(last_message_id)
@@ -0,0 +1,193 @@
+import time
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+class _Bucket:
+    """
+    สถานะของ rate limit bucket หนึ่งอัน
+    """
+    def __init__(self):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self.reset_after = 1.0
+
+class RateLimiter:
+    """
+    ตัวจัดลำดับ request ตาม rate limit ของ Discord
+
+    ติดตาม bucket ของแต่ละ route และ global limit จาก header X-RateLimit-*
+    แล้วหน่วงเวลา request ให้เร็วที่สุดเท่าที่ Discord อนุญาตโดยไม่โดน 429
+    ใช้ threading.Lock แทน asyncio.Lock เพื่อให้ใช้ร่วมกันได้ระหว่างหลาย event loop / thread
+    """
+    MAJOR_PARAMETERS = ("channels", "guilds", "webhooks")
+
+    def __init__(self, global_limit: int = 50, max_retries: int = 5):
+        self.global_limit = global_limit
+        self.max_retries = max_retries
+        self._lock = threading.Lock()
+        self._route_buckets: Dict[str, str] = {}  # route -> bucket key
+        self._buckets: Dict[str, _Bucket] = {}
+        self._global_reset_at = 0.0
+        self._window_start = 0.0
+        self._window_count = 0
+
+    @classmethod
+    def route_key(cls, method: str, url: str) -> str:
+        """
+        สร้าง key ของ route โดยคง major parameter ไว้และแทน ID อื่นด้วย {id}
+        """
+        parts = urlparse(url).path.strip("/").split("/")
+        normalized = []
+        for i, part in enumerate(parts):
+            if part.isdigit() and not (i > 0 and parts[i - 1] in cls.MAJOR_PARAMETERS):
+                normalized.append("{id}")
+            else:
+                normalized.append(part)
+        return f"{method.upper()} /{'/'.join(normalized)}"
+
+    @classmethod
+    def _major_parameter(cls, route: str) -> str:
+        parts = route.split(" ", 1)[1].strip("/").split("/")
+        for i, part in enumerate(parts[:-1]):
+            if part in cls.MAJOR_PARAMETERS:
+                return f"{part}/{parts[i + 1]}"
+        return ""
+
+    def _bucket_for(self, route: str) -> _Bucket:
+        key = self._route_buckets.get(route, route)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket()
+        return bucket
+
+    def _reserve(self, route: str) -> float:
+        """
+        จองสิทธิ์ส่ง request หนึ่งครั้ง คืนค่าเวลาที่ต้องรอ (0 = ส่งได้ทันที)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._global_reset_at:
+                return self._global_reset_at - now
+
+            if now - self._window_start >= 1.0:
+                self._window_start = now
+                self._window_count = 0
+            if self._window_count >= self.global_limit:
+                return self._window_start + 1.0 - now
+
+            bucket = self._bucket_for(route)
+            if bucket.limit is not None:
+                if now >= bucket.reset_at:
+                    bucket.remaining = bucket.limit
+                    bucket.reset_at = now + bucket.reset_after
+                if bucket.remaining <= 0:
+                    return bucket.reset_at - now
+                bucket.remaining -= 1
+
+            self._window_count += 1
+            return 0.0
+
+    async def acquire(self, route: str) -> None:
+        """
+        รอจนกว่าจะส่ง request ไปยัง route นี้ได้
+        """
+        while True:
+            delay = self._reserve(route)
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    def update(self, route: str, headers) -> None:
+        """
+        อัปเดตสถานะ bucket จาก header ของ response
+        """
+        bucket_hash = headers.get("X-RateLimit-Bucket")
+        limit = headers.get("X-RateLimit-Limit")
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if bucket_hash is None or limit is None:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            key = f"{bucket_hash}:{self._major_parameter(route)}"
+            if self._route_buckets.get(route) != key:
+                self._route_buckets[route] = key
+                self._buckets.setdefault(key, _Bucket())
+            bucket = self._buckets[key]
+            bucket.limit = int(limit)
+            if remaining is not None:
+                bucket.remaining = int(remaining)
+            if reset_after is not None:
+                bucket.reset_after = float(reset_after)
+                bucket.reset_at = now + float(reset_after)
+
+    def _handle_429(self, route: str, retry_after: float, is_global: bool) -> None:
+        with self._lock:
+            reset_at = time.monotonic() + retry_after
+            if is_global:
+                self._global_reset_at = max(self._global_reset_at, reset_at)
+            else:
+                bucket = self._bucket_for(route)
+                bucket.remaining = 0
+                bucket.reset_at = max(bucket.reset_at, reset_at)
+                if bucket.limit is None:
+                    bucket.limit = 1
+
+    @asynccontextmanager
+    async def request(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        url: str,
+        on_response: Optional[Callable[[aiohttp.ClientResponse, float], None]] = None,
+        **kwargs
+    ):
+        """
+        ส่ง request ผ่านตัวจัดลำดับ rate limit และลองใหม่อัตโนมัติเมื่อได้ 429
+
+        ใช้งานแบบเดียวกับ session.get: async with limiter.request(session, "GET", url) as resp
+        on_response(resp, latency) ถูกเรียกกับทุก response รวมถึง 429 ที่ถูกลองใหม่
+        (latency ไม่รวมเวลาที่รอ rate limit)
+        """
+        route = self.route_key(method, url)
+        attempt = 0
+        while True:
+            await self.acquire(route)
+            started = time.monotonic()
+            resp = await session.request(method, url, **kwargs)
+            if on_response is not None:
+                on_response(resp, time.monotonic() - started)
+            self.update(route, resp.headers)
+
+            if resp.status == 429 and attempt < self.max_retries:
+                attempt += 1
+                try:
+                    data = await resp.json(content_type=None) or {}
+                except (aiohttp.ContentTypeError, ValueError):
+                    data = {}
+                retry_after = float(data.get("retry_after") or resp.headers.get("Retry-After", 1))
+                is_global = bool(data.get("global")) or resp.headers.get("X-RateLimit-Global") == "true"
+                resp.release()
+                self._handle_429(route, retry_after, is_global)
+                continue
+
+            try:
+                yield resp
+            finally:
+                resp.release()
+            return
+
+_default_rate_limiter = RateLimiter()
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    คืนค่าตัวจัดลำดับ rate limit ที่ใช้ร่วมกันทั้งโปรเซส
+    """
+    return _default_rate_limiter
@@ -0,0 +1,34 @@
+import sqlite3
+import threading
+
+class SQLiteStore:
+    """
+    คลาสพื้นฐานของที่เก็บข้อมูลแบบ SQLite (WAL)
+
+    เปิด connection แยกตาม thread เพราะ sqlite3 ใช้ connection ข้าม thread ไม่ได้
+    โหมด WAL ทำให้หลาย worker / หลายโปรเซสอ่านเขียนไฟล์เดียวกันได้พร้อมกัน
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        คืนค่า connection ของ thread ปัจจุบัน
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """
+        ปิด connection ของ thread ปัจจุบัน
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -1,71 +1,160 @@
-import os
-import json
-import platform
-from typing import Dict, Optional
-from plyer import notification
-
-def load_config(config_file: str = "config.json") -> Dict:
-    """
-    โหลดการตั้งค่าจากไฟล์ config
-    """
-    if os.path.exists(config_file):
-        with open(config_file, "r") as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return {}
-    return {}
-
-def save_config(token: str, guild_id: str, config_file: str = "config.json") -> None:
-    """
-    บันทึกการตั้งค่าไปยังไฟล์ config
-    """
-    with open(config_file, "w") as f:
-        json.dump({"token": token, "guild_id": guild_id}, f, indent=4)
-
-def show_notification(title: str, message: str) -> None:
-    """
-    แสดงการแจ้งเตือนระบบ
-    """
-    try:
-        notification.notify(
-            title=title,
-            message=message,
-            app_name="Discord Downloader",
-            timeout=10
-        )
-    except Exception as e:
-        print(f"Failed to show notification: {e}")
-
-def open_file_in_explorer(file_path: str) -> None:
-    """
-    เปิดไฟล์ใน File Explorer
-    """
-    try:
-        if platform.system() == "Windows":
-            os.startfile(os.path.dirname(file_path))
-        elif platform.system() == "Darwin":
-            os.system(f"open '{os.path.dirname(file_path)}'")
-        else:
-            os.system(f"xdg-open '{os.path.dirname(file_path)}'")
-    except Exception as e:
-        print(f"Failed to open file explorer: {e}")
-
-def format_file_size(size_bytes: int) -> str:
-    """
-    จัดรูปแบบขนาดไฟล์ให้อ่านง่าย
-    """
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.2f} TB"
-
-def sanitize_filename(filename: str) -> str:
-    """
-    ทำความสะอาดชื่อไฟล์
-    """
-    invalid_chars = '<>:"/\\|?*'
-    for ch in invalid_chars:
-        filename = filename.replace(ch, '_')
+import os
+import json
+import hashlib
+import platform
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from .auth import TokenValidator
+from .ratelimit import get_rate_limiter
+from .http import get_session
+from .cache import get_lookup_cache
+
+def load_config(config_file: str = "config.json") -> Dict:
+    """
+    โหลดการตั้งค่าจากไฟล์ config
+    """
+    if os.path.exists(config_file):
+        with open(config_file, "r") as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError:
+                return {}
+    return {}
+
+def save_config(token: str, guild_id: str, config_file: str = "config.json") -> None:
+    """
+    บันทึกการตั้งค่าไปยังไฟล์ config
+    """
+    with open(config_file, "w") as f:
+        json.dump({"token": token, "guild_id": guild_id}, f, indent=4)
+
+CHANNELS_TTL = 300  # วินาที
+
+# ประเภทช่องทางของ Discord ที่ดาวน์โหลดได้
+TEXT_CHANNEL_TYPES = (0, 5)   # text, announcement
+FORUM_CHANNEL_TYPES = (15,)   # forum
+
+def download_channel_type(channel: Dict) -> Optional[str]:
+    """
+    คืนค่า channel_type ของ DownloadTask ("text" / "forum") หรือ None ถ้าดาวน์โหลดไม่ได้
+    """
+    if channel.get("type") in TEXT_CHANNEL_TYPES:
+        return "text"
+    if channel.get("type") in FORUM_CHANNEL_TYPES:
+        return "forum"
+    return None
+
+async def get_guild_channels(token: str, guild_id: str, refresh: bool = False) -> List[Dict]:
+    """
+    ดึงรายการช่องทางทั้งหมดใน Guild (ใช้ cache ถ้ายังไม่หมดอายุ)
+    """
+    cache = get_lookup_cache()
+    key = f"{guild_id}:{cache.token_key(token)}"
+    if not refresh:
+        cached = cache.get("channels", key)
+        if cached is not None:
+            return cached
+
+    url = f"https://discord.com/api/v9/guilds/{guild_id}/channels"
+    async with get_rate_limiter().request(get_session(), "GET", url, headers={"Authorization": token}) as resp:
+        if resp.status != 200:
+            raise Exception(f"Failed to fetch channels: {resp.status}")
+        channels = await resp.json()
+    cache.set("channels", key, channels, CHANNELS_TTL, guild_id=guild_id)
+    return channels
+
+async def is_token_valid(token: str, refresh: bool = False) -> bool:
+    """
+    ตรวจสอบว่า Token ถูกต้องหรือไม่
+    """
+    return await TokenValidator.validate_token(token, refresh)
+
+async def is_in_guild(token: str, guild_id: str, refresh: bool = False) -> bool:
+    """
+    ตรวจสอบว่า Token อยู่ใน Guild ที่กำหนดหรือไม่
+    """
+    return await TokenValidator.check_guild_membership(token, guild_id, refresh)
+
+DISCORD_EPOCH = 1420070400000  # มิลลิวินาที (2015-01-01 UTC)
+
+def to_utc(value: datetime) -> datetime:
+    """
+    แปลงเวลาเป็นเวลา UTC แบบมี timezone (เวลาที่ไม่มี timezone ถือเป็นเวลาท้องถิ่น)
+    """
+    return value.astimezone(timezone.utc)
+
+def datetime_to_snowflake(value: datetime) -> int:
+    """
+    แปลงเวลาเป็น snowflake ที่เล็กที่สุดของเวลานั้น (ใช้เป็น cursor before / after ได้)
+    """
+    return max(int(value.timestamp() * 1000) - DISCORD_EPOCH, 0) << 22
+
+def snowflake_to_datetime(snowflake) -> datetime:
+    """
+    แปลง snowflake (ID ของ Discord) เป็นเวลาที่สร้าง
+    """
+    return datetime.fromtimestamp(((int(snowflake) >> 22) + DISCORD_EPOCH) / 1000)
+
+def invalidate_guild_cache(guild_id: str) -> None:
+    """
+    ล้าง cache ทั้งหมดของ Guild (เช่น หลังจากมีการเพิ่ม/ลบช่องทาง)
+    """
+    get_lookup_cache().invalidate(guild_id=guild_id)
+
+def show_notification(title: str, message: str) -> None:
+    """
+    แสดงการแจ้งเตือนระบบ
+    """
+    try:
+        from plyer import notification
+        notification.notify(
+            title=title,
+            message=message,
+            app_name="Discord Downloader",
+            timeout=10
+        )
+    except Exception as e:
+        print(f"Failed to show notification: {e}")
+
+def open_file_in_explorer(file_path: str) -> None:
+    """
+    เปิดไฟล์ใน File Explorer
+    """
+    try:
+        if platform.system() == "Windows":
+            os.startfile(os.path.dirname(file_path))
+        elif platform.system() == "Darwin":
+            os.system(f"open '{os.path.dirname(file_path)}'")
+        else:
+            os.system(f"xdg-open '{os.path.dirname(file_path)}'")
+    except Exception as e:
+        print(f"Failed to open file explorer: {e}")
+
+def format_file_size(size_bytes: int) -> str:
+    """
+    จัดรูปแบบขนาดไฟล์ให้อ่านง่าย
+    """
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size_bytes < 1024.0:
+            return f"{size_bytes:.2f} {unit}"
+        size_bytes /= 1024.0
+    return f"{size_bytes:.2f} TB"
+
+def file_sha256(file_path: str, digest=None) -> str:
+    """
+    คำนวณ SHA-256 ของไฟล์ (ถ้าส่ง digest มาจะอัปเดต digest นั้นต่อจากข้อมูลเดิม)
+    """
+    digest = digest if digest is not None else hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def sanitize_filename(filename: str) -> str:
+    """
+    ทำความสะอาดชื่อไฟล์
+    """
+    invalid_chars = '<>:"/\\|?*'
+    for ch in invalid_chars:
+        filename = filename.replace(ch, '_')
     return filename.strip(' .')
\ No newline at end of file
@@ -0,0 +1,280 @@
+import asyncio
+
+import pytest
+
+from core.downloader import ChannelDownloader, ForumDownloader
+
+
+def _pages(count: int, per_page: int = 100):
+    pages = []
+    for start in range(count, 0, -per_page):
+        pages.append([
+            {"id": str(10_000 + i), "attachments": [{"id": str(i), "filename": f"f{i}.bin", "url": f"https://cdn/{i}", "size": 1}]}
+            for i in range(start, max(start - per_page, 0), -1)
+        ])
+    return pages
+
+
+def test_worker_failure_cancels_crawl(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    downloader = ChannelDownloader("token", "guild", save_metadata=False)
+    calls = {"downloads": 0}
+
+    async def fake_pages(self, session, channel_id, before=None, after=None, forward=False):
+        for page in _pages(600):
+            yield page
+
+    async def fake_download(self, attachment, folder, session):
+        calls["downloads"] += 1
+        if calls["downloads"] >= 3:
+            raise RuntimeError("disk full")
+        return True
+
+    monkeypatch.setattr(ChannelDownloader, "_iter_message_pages", fake_pages)
+    monkeypatch.setattr(ChannelDownloader, "_limited_download", fake_download)
+
+    async def run():
+        with pytest.raises(RuntimeError, match="disk full"):
+            await asyncio.wait_for(downloader.download_attachments_from_channel(None, "1", "chan"), 5)
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(run()) == []
+
+
+def test_segmented_download_keeps_finished_segments_on_server_error(tmp_path, monkeypatch):
+    from aiohttp import ClientSession, web
+
+    monkeypatch.chdir(tmp_path)
+    size = 4000
+    data = bytes(range(256)) * (size // 256) + bytes(size % 256)
+    state = {"fail_from": 2000, "requests": []}
+
+    async def cdn(request):
+        start, end = request.headers["Range"].split("=")[1].split("-")
+        start, end = int(start), int(end)
+        state["requests"].append(start)
+        if start >= state["fail_from"]:
+            return web.Response(status=503)
+        return web.Response(status=206, body=data[start:end + 1],
+                            headers={"Content-Range": f"bytes {start}-{end}/{size}", "ETag": '"e"'})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/file", cdn)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        attachment = {"id": "1", "filename": "a.bin", "url": f"http://127.0.0.1:{port}/file", "size": size}
+        downloader = ChannelDownloader("token", "guild", download_segments=4, segment_threshold=1)
+        try:
+            async with ClientSession() as session:
+                first = await downloader._limited_download(attachment, ".", session)
+                kept = sorted(path.name for path in tmp_path.iterdir())
+                state["fail_from"] = size
+                state["requests"].clear()
+                second = await downloader._limited_download(attachment, ".", session)
+                return first, kept, sorted(state["requests"]), second
+        finally:
+            await runner.cleanup()
+
+    first, kept, retried, second = asyncio.run(run())
+    assert first is False
+    assert "a.bin.1.part" in kept and "a.bin.1.part.json" in kept
+    assert retried == [2000, 3000]  # ดาวน์โหลดต่อเฉพาะช่วงที่ยังขาด
+    assert second is True
+    assert (tmp_path / "a.bin").read_bytes() == data
+
+
+def test_segmented_download_completes_short_ranges(tmp_path, monkeypatch):
+    from aiohttp import ClientSession, web
+
+    monkeypatch.chdir(tmp_path)
+    size = 4000
+    data = bytes(range(256)) * (size // 256) + bytes(size % 256)
+    requests = []
+
+    async def cdn(request):
+        start, end = request.headers["Range"].split("=")[1].split("-")
+        start, end = int(start), min(int(end), int(start) + 599)  # ตอบไม่เกิน 600 byte ต่อ request
+        requests.append(start)
+        return web.Response(status=206, body=data[start:end + 1],
+                            headers={"Content-Range": f"bytes {start}-{end}/{size}"})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/file", cdn)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        attachment = {"id": "1", "filename": "a.bin", "url": f"http://127.0.0.1:{port}/file", "size": size}
+        downloader = ChannelDownloader("token", "guild", download_segments=4, segment_threshold=1)
+        try:
+            async with ClientSession() as session:
+                return await downloader._limited_download(attachment, ".", session)
+        finally:
+            await runner.cleanup()
+
+    assert asyncio.run(run()) is True
+    assert sorted(requests) == [0, 600, 1000, 1600, 2000, 2600, 3000, 3600]
+    assert (tmp_path / "a.bin").read_bytes() == data
+
+
+def test_same_filename_gets_unique_local_path(tmp_path, monkeypatch):
+    from aiohttp import ClientSession, web
+
+    monkeypatch.chdir(tmp_path)
+    bodies = {"1": b"first", "2": b"second"}
+
+    async def cdn(request):
+        return web.Response(body=bodies[request.match_info["id"]])
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/{id}", cdn)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        async def fake_pages(self, session, channel_id, before=None, after=None, forward=False):
+            yield [
+                {"id": f"1{i}", "attachments": [
+                    {"id": i, "filename": "image.png", "url": f"http://127.0.0.1:{port}/{i}", "size": len(bodies[i])}
+                ]}
+                for i in ("2", "1")
+            ]
+
+        monkeypatch.setattr(ChannelDownloader, "_iter_message_pages", fake_pages)
+        try:
+            async with ClientSession() as session:
+                for _ in range(2):
+                    downloader = ChannelDownloader("token", "guild", save_metadata=False)
+                    await downloader.download_attachments_from_channel(session, "1", "chan")
+                    assert downloader._manifests == {}
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(run())
+    folder = tmp_path / "DOWNLOADS" / "chan"
+    assert (folder / "image.png").read_bytes() == b"second"
+    assert (folder / "1_image.png").read_bytes() == b"first"
+
+
+def test_forum_progress_is_summed_across_threads(monkeypatch):
+    downloader = ForumDownloader("token", "guild", save_metadata=False)
+    calls = []
+
+    async def fake_threads(self, session, forum_channel_id):
+        for i in range(3):
+            yield {"id": str(i), "name": f"t{i}"}
+
+    async def fake_channel(self, session, channel_id, channel_name, progress_callback=None, incremental=False, **kwargs):
+        calls.append(incremental)
+        for current in range(1, 3):
+            await asyncio.sleep(0)
+            progress_callback(current, 2, channel_name)
+
+    monkeypatch.setattr(ForumDownloader, "iter_threads_in_forum", fake_threads)
+    monkeypatch.setattr(ForumDownloader, "download_attachments_from_channel", fake_channel)
+
+    progress = []
+    asyncio.run(downloader.download_forum_channel(
+        None, {"id": "f", "name": "forum"}, lambda current, total, message: progress.append((current, total)),
+        incremental=True
+    ))
+    assert calls == [True, True, True]
+    assert [current for current, _ in progress] == list(range(1, 7))
+    assert progress[-1] == (6, 6)
+
+
+def test_message_id_bounds_mixes_aware_dates_with_days():
+    from datetime import datetime, timedelta, timezone
+
+    from core.models import DownloadFilter
+    from core.utils import datetime_to_snowflake
+
+    after = datetime.now(timezone(timedelta(hours=7))) - timedelta(days=400)
+    filters = DownloadFilter(after=after, before=datetime(2100, 1, 1), days=2)
+    lower, upper = ChannelDownloader._message_id_bounds(filters)
+    recent = datetime_to_snowflake(datetime.now(timezone.utc) - timedelta(days=2))
+    assert abs((lower >> 22) - (recent >> 22)) < 60_000
+    assert upper == datetime_to_snowflake(datetime(2100, 1, 1))
+
+
+def test_failed_file_holds_checkpoint_and_high_water_mark(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    state = {"fail": "150", "tried": []}
+
+    async def fake_pages(self, session, channel_id, before=None, after=None, forward=False):
+        for page in _pages(300):
+            if after is None or int(page[0]["id"]) > int(after):
+                yield [msg for msg in page if after is None or int(msg["id"]) > int(after)]
+
+    async def fake_download(self, attachment, folder, session):
+        state["tried"].append(attachment["id"])
+        return attachment["id"] != state["fail"]
+
+    monkeypatch.setattr(ChannelDownloader, "_iter_message_pages", fake_pages)
+    monkeypatch.setattr(ChannelDownloader, "_limited_download", fake_download)
+
+    checkpoints = []
+    downloader = ChannelDownloader("token", "guild", save_metadata=False)
+    with pytest.raises(Exception, match="Failed to download 1 file"):
+        asyncio.run(downloader.download_attachments_from_channel(
+            None, "1", "chan", checkpoint_callback=checkpoints.append, incremental=True
+        ))
+    # หน้าแรก (10300-10201) เสร็จแล้ว หน้าที่มีไฟล์ล้มเหลวและหน้าหลังจากนั้นไม่ถูก checkpoint
+    assert checkpoints == ["10201"]
+
+    state.update(fail=None, tried=[])
+    downloader = ChannelDownloader("token", "guild", save_metadata=False)
+    asyncio.run(downloader.download_attachments_from_channel(None, "1", "chan", incremental=True))
+    assert "150" in state["tried"]
+    assert downloader._get_manifest("DOWNLOADS/chan").get_sync_state("high_water_mark") == "10300"
+
+
+def test_sliced_crawl_high_water_mark_is_newest_message_seen(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def fake_pages(self, session, channel_id, before=None, after=None, forward=False):
+        for page in _pages(300):
+            page = [msg for msg in page if int(msg["id"]) < int(before) and int(msg["id"]) > int(after)]
+            if page:
+                yield page
+
+    async def fake_download(self, attachment, folder, session):
+        return True
+
+    monkeypatch.setattr(ChannelDownloader, "_iter_message_pages", fake_pages)
+    monkeypatch.setattr(ChannelDownloader, "_limited_download", fake_download)
+
+    downloader = ChannelDownloader("token", "guild", save_metadata=False)
+    asyncio.run(downloader.download_attachments_from_channel(None, "1", "chan", incremental=True, slices=3))
+    # ไม่ใช่ขอบบนของช่วง (เวลาปัจจุบัน + 1 วินาที) ที่ข้อความซึ่งโพสต์ระหว่างดึงอาจอยู่ก่อนหน้า
+    assert downloader._get_manifest("DOWNLOADS/chan").get_sync_state("high_water_mark") == "10300"
+
+
+def test_forum_thread_failure_fails_the_forum(monkeypatch):
+    downloader = ForumDownloader("token", "guild", save_metadata=False)
+    finished = []
+
+    async def fake_threads(self, session, forum_channel_id):
+        for i in range(3):
+            yield {"id": str(i), "name": f"t{i}"}
+
+    async def fake_channel(self, session, channel_id, channel_name, progress_callback=None, **kwargs):
+        if channel_id == "1":
+            raise RuntimeError("HTTP 500")
+        finished.append(channel_id)
+
+    monkeypatch.setattr(ForumDownloader, "iter_threads_in_forum", fake_threads)
+    monkeypatch.setattr(ForumDownloader, "download_attachments_from_channel", fake_channel)
+
+    with pytest.raises(Exception, match=r"1 thread\(s\) failed: .*t1: HTTP 500"):
+        asyncio.run(downloader.download_forum_channel(None, {"id": "f", "name": "forum"}))
+    assert sorted(finished) == ["0", "2"]
@@ -0,0 +1,46 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from PyQt6.QtCore import QCoreApplication
+
+import core.qt as qt
+from core.downloader import ChannelDownloader
+
+
+@pytest.fixture(autouse=True)
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def test_download_worker_reports_progress_through_aggregator(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def fake_download(self, session, channel_id, channel_name, progress_callback=None,
+                            start_from=None, checkpoint_callback=None, **kwargs):
+        # ChannelDownloader เรียก progress_callback ด้วย 3 ค่า (downloaded, total, message)
+        for i in range(1, 11):
+            self.bytes_downloaded += 100
+            progress_callback(i, 10, f"Downloading {channel_name} - f{i}.bin")
+            checkpoint_callback(str(1000 - i))
+
+    monkeypatch.setattr(ChannelDownloader, "download_attachments_from_channel", fake_download)
+
+    worker = qt.DownloadWorker("token", "guild", "1", "chan")
+    progress, sizes, errors, done = [], [], [], []
+    worker.progress_updated.connect(lambda current, total, message: progress.append((current, total, message)))
+    worker.bytes_updated.connect(sizes.append)
+    worker.error_occurred.connect(errors.append)
+    worker.download_complete.connect(done.append)
+    saved = []
+    monkeypatch.setattr(worker.resumer, "record", lambda channel_id, state: saved.append(state))
+
+    worker.run()
+
+    assert errors == []
+    assert done == ["Download complete: chan"]
+    # การอัปเดตถูกรวมโดย ProgressAggregator: ส่งไม่กี่ครั้งและค่าสุดท้ายครบเสมอ
+    assert 1 <= len(progress) < 10
+    assert progress[-1] == (10, 10, "Downloading chan - f10.bin")
+    assert sizes[-1] == 1000
+    assert saved and saved[-1]["last_message_id"] == "990"
@@ -1,31 +1,39 @@
-from .main_window import DiscordFileDownloader
-from .components.buttons import RippleButton, FloatingActionButton, ToggleSwitch
-from .components.charts import StatsDashboard
-from .components.dialogs import (
-    DiscordOAuthWindow,
-    ToastNotification,
-    FilePreviewer
-)
-from .components.widgets import (
-    DownloadScheduler,
-    FileTagger,
-    FileSearch
-)
-from .themes import apply_theme, DARK_THEME, LIGHT_THEME
-
-__all__ = [
-    'DiscordFileDownloader',
-    'RippleButton',
-    'FloatingActionButton',
-    'ToggleSwitch',
-    'StatsDashboard',
-    'DiscordOAuthWindow',
-    'ToastNotification',
-    'FilePreviewer',
-    'DownloadScheduler',
-    'FileTagger',
-    'FileSearch',
-    'apply_theme',
-    'DARK_THEME',
-    'LIGHT_THEME'
-]
\ No newline at end of file
+from .main_window import DiscordFileDownloader
+from .components import (
+    RippleButton,
+    FloatingActionButton,
+    ToggleSwitch,
+    DiscordOAuthWindow,
+    ToastNotification,
+    FilePreviewer,
+    DownloadScheduler,
+    FileTagger,
+    FileSearch,
+    LazyWidget
+)
+from .themes import apply_theme, DARK_THEME, LIGHT_THEME
+
+__all__ = [
+    'DiscordFileDownloader',
+    'RippleButton',
+    'FloatingActionButton',
+    'ToggleSwitch',
+    'StatsDashboard',
+    'DiscordOAuthWindow',
+    'ToastNotification',
+    'FilePreviewer',
+    'DownloadScheduler',
+    'FileTagger',
+    'FileSearch',
+    'LazyWidget',
+    'apply_theme',
+    'DARK_THEME',
+    'LIGHT_THEME'
+]
+
+def __getattr__(name):
+    # StatsDashboard โหลด QtChart จึงส่งต่อไปยัง ui.components เมื่อเรียกใช้ครั้งแรก
+    if name == 'StatsDashboard':
+        from . import components
+        return components.StatsDashboard
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
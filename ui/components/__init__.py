@@ -1,17 +1,31 @@
-from .buttons import RippleButton, FloatingActionButton, ToggleSwitch
-from .charts import StatsDashboard
-from .dialogs import DiscordOAuthWindow, ToastNotification, FilePreviewer
-from .widgets import DownloadScheduler, FileTagger, FileSearch
-
-__all__ = [
-    'RippleButton',
-    'FloatingActionButton',
-    'ToggleSwitch',
-    'StatsDashboard',
-    'DiscordOAuthWindow',
-    'ToastNotification',
-    'FilePreviewer',
-    'DownloadScheduler',
-    'FileTagger',
-    'FileSearch'
-]
\ No newline at end of file
+import importlib
+from .buttons import RippleButton, FloatingActionButton, ToggleSwitch
+from .dialogs import DiscordOAuthWindow, ToastNotification, FilePreviewer
+from .widgets import DownloadScheduler, FileTagger, FileSearch, LazyWidget
+
+__all__ = [
+    'RippleButton',
+    'FloatingActionButton',
+    'ToggleSwitch',
+    'StatsDashboard',
+    'DiscordOAuthWindow',
+    'ToastNotification',
+    'FilePreviewer',
+    'DownloadScheduler',
+    'FileTagger',
+    'FileSearch',
+    'LazyWidget'
+]
+
+# component ที่ต้องใช้ Qt module ขนาดใหญ่ (QtChart) จะถูก import เมื่อเรียกใช้ครั้งแรก
+_LAZY_IMPORTS = {
+    'StatsDashboard': '.charts'
+}
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
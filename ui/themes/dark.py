@@ -1,23 +1,23 @@
-DARK_THEME = {
-    "name": "Dark",
-    "background": "#36393f",
-    "text": "#ffffff",
-    "primary": "#5865F2",
-    "secondary": "#2F3136",
-    "tertiary": "#202225",
-    "success": "#57F287",
-    "danger": "#ED4245",
-    "warning": "#FEE75C",
-    "info": "#2BC2FF",
-    "highlight": "#EB459E",
-    "scrollbar": "#202225",
-    "scrollbar_handle": "#4E5058",
-    "border": "#4E5058",
-    "tooltip": "#18191C",
-    "button": {
-        "normal": "#5865F2",
-        "hover": "#4752C4",
-        "pressed": "#3C45A5",
-        "disabled": "#4E5058"
-    }
+DARK_THEME = {
+    "name": "Dark",
+    "background": "#36393f",
+    "text": "#ffffff",
+    "primary": "#5865F2",
+    "secondary": "#2F3136",
+    "tertiary": "#202225",
+    "success": "#57F287",
+    "danger": "#ED4245",
+    "warning": "#FEE75C",
+    "info": "#2BC2FF",
+    "highlight": "#EB459E",
+    "scrollbar": "#202225",
+    "scrollbar_handle": "#4E5058",
+    "border": "#4E5058",
+    "tooltip": "#18191C",
+    "button": {
+        "normal": "#5865F2",
+        "hover": "#4752C4",
+        "pressed": "#3C45A5",
+        "disabled": "#4E5058"
+    }
 }
\ No newline at end of file
@@ -1,23 +1,23 @@
-LIGHT_THEME = {
-    "name": "Light",
-    "background": "#FFFFFF",
-    "text": "#2E3338",
-    "primary": "#5865F2",
-    "secondary": "#F2F3F5",
-    "tertiary": "#EBEDEF",
-    "success": "#57F287",
-    "danger": "#ED4245",
-    "warning": "#FEE75C",
-    "info": "#2BC2FF",
-    "highlight": "#EB459E",
-    "scrollbar": "#EBEDEF",
-    "scrollbar_handle": "#D4D7DC",
-    "border": "#C3C6CB",
-    "tooltip": "#FFFFFF",
-    "button": {
-        "normal": "#5865F2",
-        "hover": "#4752C4",
-        "pressed": "#3C45A5",
-        "disabled": "#E3E5E8"
-    }
+LIGHT_THEME = {
+    "name": "Light",
+    "background": "#FFFFFF",
+    "text": "#2E3338",
+    "primary": "#5865F2",
+    "secondary": "#F2F3F5",
+    "tertiary": "#EBEDEF",
+    "success": "#57F287",
+    "danger": "#ED4245",
+    "warning": "#FEE75C",
+    "info": "#2BC2FF",
+    "highlight": "#EB459E",
+    "scrollbar": "#EBEDEF",
+    "scrollbar_handle": "#D4D7DC",
+    "border": "#C3C6CB",
+    "tooltip": "#FFFFFF",
+    "button": {
+        "normal": "#5865F2",
+        "hover": "#4752C4",
+        "pressed": "#3C45A5",
+        "disabled": "#E3E5E8"
+    }
 }
\ No newline at end of file